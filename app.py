@@ -1,16 +1,32 @@
+import atexit
+import gzip
+import hashlib
+import hmac
 import math
+import multiprocessing
 import os
+import queue
 import sqlite3
 import secrets
 import smtplib
+import threading
 import time
 import json
+import itertools
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from datetime import date, timedelta
+from functools import lru_cache
 from email.message import EmailMessage
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 import zipfile
-from flask import Flask, flash, g, jsonify, redirect, render_template, request, session, url_for
+import zlib
+import click
+from flask import Flask, flash, g, has_request_context, jsonify, redirect, render_template, request, session, url_for
+from flask.cli import AppGroup
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import check_password_hash, generate_password_hash
 from dotenv import load_dotenv
@@ -23,16 +39,65 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     psycopg = None
     dict_row = None
+try:
+    from psycopg_pool import ConnectionPool, PoolTimeout
+except Exception:  # pragma: no cover - optional dependency
+    ConnectionPool = None
+    PoolTimeout = None
+try:
+    import fcntl
+except Exception:  # pragma: no cover - not available on Windows
+    fcntl = None
 try:
     from docx import Document
 except Exception:  # pragma: no cover - optional dependency
     Document = None
+try:
+    import msgpack
+except Exception:  # pragma: no cover - optional dependency
+    msgpack = None
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DOWNLOADS_DIR = os.path.join(os.environ.get("USERPROFILE", ""), "Downloads")
 DB_PATH = os.environ.get("ATTENDANCE_DB_PATH", "").strip() or os.path.join(BASE_DIR, "attendance.db")
 DATABASE_URL = os.environ.get("DATABASE_URL", "").strip()
 DATABASE_FALLBACK_SQLITE = os.environ.get("DATABASE_FALLBACK_SQLITE", "1") == "1"
+DATABASE_POOL_ENABLED = os.environ.get("DATABASE_POOL_ENABLED", "1") == "1"
+DATABASE_POOL_MIN_SIZE = int(os.environ.get("DATABASE_POOL_MIN_SIZE", "1"))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("DATABASE_POOL_MAX_SIZE", "5"))
+DATABASE_POOL_MAX_IDLE = float(os.environ.get("DATABASE_POOL_MAX_IDLE", "300"))
+DATABASE_POOL_MAX_LIFETIME = float(os.environ.get("DATABASE_POOL_MAX_LIFETIME", "3600"))
+DATABASE_POOL_TIMEOUT = float(os.environ.get("DATABASE_POOL_TIMEOUT", "10"))
+DATABASE_POOL_CHECK = os.environ.get("DATABASE_POOL_CHECK", "1") == "1"
+DATABASE_CONNECT_TIMEOUT = float(os.environ.get("DATABASE_CONNECT_TIMEOUT", "2"))
+DATABASE_READ_URLS = [
+    url.strip() for url in os.environ.get("DATABASE_READ_URL", "").split(",") if url.strip()
+]
+DATABASE_READ_YOUR_WRITES_SECONDS = int(os.environ.get("DATABASE_READ_YOUR_WRITES_SECONDS", "5"))
+DATABASE_READ_CONNECT_TIMEOUT = float(os.environ.get("DATABASE_READ_CONNECT_TIMEOUT", "2"))
+DATABASE_READ_RETRY_SECONDS = float(os.environ.get("DATABASE_READ_RETRY_SECONDS", "30"))
+READ_REPLICA_ENDPOINTS = {
+    "dashboard",
+    "timetable",
+    "teacher_students",
+    "teacher_notifications",
+    "admin",
+}
+DATABASE_PREPARED_STATEMENTS = os.environ.get("DATABASE_PREPARED_STATEMENTS", "1") == "1"
+DATABASE_STATEMENT_CACHE_SIZE = int(os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", "256"))
+DB_QUERY_BUDGET = int(os.environ.get("DB_QUERY_BUDGET", "50"))
+DB_REPEATED_QUERY_THRESHOLD = int(os.environ.get("DB_REPEATED_QUERY_THRESHOLD", "10"))
+DB_QUERY_DEBUG_HEADER = os.environ.get("DB_QUERY_DEBUG_HEADER", "0") == "1"
+DB_QUERY_STATS_MAX_STATEMENTS = int(os.environ.get("DB_QUERY_STATS_MAX_STATEMENTS", "256"))
+SQLITE_PERFORMANCE_PROFILE = os.environ.get("SQLITE_PERFORMANCE_PROFILE", "0") == "1"
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper() or "NORMAL"
+SQLITE_CACHE_SIZE = int(os.environ.get("SQLITE_CACHE_SIZE", "-16000"))
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", "4"))
+SQLITE_WRITE_QUEUE = os.environ.get("SQLITE_WRITE_QUEUE", "0") == "1"
+SQLITE_WRITE_QUEUE_MAX_BATCH = int(os.environ.get("SQLITE_WRITE_QUEUE_MAX_BATCH", "64"))
+SQLITE_WRITE_QUEUE_WINDOW_MS = float(os.environ.get("SQLITE_WRITE_QUEUE_WINDOW_MS", "2"))
+SQLITE_WRITE_QUEUE_TIMEOUT = float(os.environ.get("SQLITE_WRITE_QUEUE_TIMEOUT", "30"))
 AUTO_NORMALIZE_ATTENDANCE_ON_STARTUP = (
     os.environ.get("AUTO_NORMALIZE_ATTENDANCE_ON_STARTUP", "0") == "1"
 )
@@ -43,7 +108,18 @@ ATTENDANCE_WINDOW_START = date(2026, 1, 19)
 ATTENDANCE_WINDOW_END = date(2026, 1, 31)
 ATTENDANCE_TOTAL_CLASSES = 61
 ATTENDANCE_HOLIDAYS = {date(2026, 1, 26)}
+SYNTHESIZED_ATTENDANCE_SUBJECT = "Overall"
+ATTENDANCE_UNIQUE_INDEX_NAME = "uq_attendance_student_date_subject"
 ATTENDANCE_SNAPSHOT_PATH = os.path.join(BASE_DIR, "data", "attendance_snapshot_2026_01_19_31.json")
+STUDENT_DATA_SHEETS = [
+    name.strip() for name in os.environ.get("STUDENT_DATA_SHEETS", "").split(",") if name.strip()
+]
+STUDENT_IMPORT_CHUNK_SIZE = int(os.environ.get("STUDENT_IMPORT_CHUNK_SIZE", "500"))
+MAINTENANCE_CHUNK_SIZE = int(os.environ.get("MAINTENANCE_CHUNK_SIZE", "500"))
+CIVIL_SEED_MANIFEST_PATH = "builtin:civil"
+XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+XLSX_PACKAGE_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
 STUDENT_DATA_PATHS = [
     os.environ.get("STUDENT_DATA_XLSX", "").strip(),
     os.path.join(BASE_DIR, "25Batch_Students_data.xlsx"),
@@ -124,44 +200,174 @@ ADMIN_TEACHER_USERNAME = os.environ.get("ADMIN_TEACHER_USERNAME", "HODMIC@").str
 ADMIN_TEACHER_PASSWORD = os.environ.get("ADMIN_TEACHER_PASSWORD", "hod123@").strip()
 ADMIN_TEACHER_EMAIL = os.environ.get("ADMIN_TEACHER_EMAIL", "hodmic@college.local").strip().lower()
 EXTERNAL_SYNC_TOKEN = os.environ.get("EXTERNAL_SYNC_TOKEN", "").strip()
+SYNC_CHUNK_SIZE = int(os.environ.get("SYNC_CHUNK_SIZE", "500"))
+SYNC_STREAM_CHUNK_SIZE = int(os.environ.get("SYNC_STREAM_CHUNK_SIZE", "1000"))
+SYNC_COPY_THRESHOLD = int(os.environ.get("SYNC_COPY_THRESHOLD", "2000"))
+SYNC_STREAM_MAX_CHUNK_SIZE = 10000
+SYNC_STREAM_MAX_ERRORS = 100
+SYNC_STREAM_MAX_LINE_BYTES = int(os.environ.get("SYNC_STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+SYNC_MAX_BODY_BYTES = int(os.environ.get("SYNC_MAX_BODY_BYTES", str(64 * 1024 * 1024)))
+MSGPACK_CONTENT_TYPES = {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+SYNC_JOB_EXECUTOR = os.environ.get("SYNC_JOB_EXECUTOR", "thread").strip().lower()
+SYNC_JOB_WORKERS = int(os.environ.get("SYNC_JOB_WORKERS", "1"))
+SYNC_JOB_LEASE_SECONDS = int(os.environ.get("SYNC_JOB_LEASE_SECONDS", "300"))
+CHANGE_FEED_PAGE_SIZE = int(os.environ.get("CHANGE_FEED_PAGE_SIZE", "500"))
+CHANGE_FEED_MAX_PAGE_SIZE = 5000
+CHANGE_FEED_STUDENT_COLUMNS = ("name", "first_name", "last_name", "roll_no", "email", "department", "semester")
+CHANGE_FEED_ATTENDANCE_COLUMNS = ("student_id", "attendance_date", "subject", "status")
+CHANGE_FEED_RETENTION_DAYS = int(os.environ.get("CHANGE_FEED_RETENTION_DAYS", "30"))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1)
+DOCX_PARSE_WORKERS = int(os.environ.get("DOCX_PARSE_WORKERS") or os.cpu_count() or 1)
+PASSWORD_HASH_PARALLEL_MIN = int(os.environ.get("PASSWORD_HASH_PARALLEL_MIN", "16"))
+DEFAULT_PASSWORD_PENDING = os.environ.get("DEFAULT_PASSWORD_PENDING", "0") == "1"
+PENDING_PASSWORD_HASH = "pending:roll_no"
+# Stays under SQLite's historical 999 bound-parameter limit.
+SQL_MAX_PARAMETERS = 900
+SCHEMA_MIGRATION_LOCK_ID = 7410001
 
 _TIMETABLE_CACHE: Dict[str, dict] = {}
 _TIMETABLE_CACHE_PATH: Optional[str] = None
 _TIMETABLE_CACHE_MTIME: Optional[float] = None
 _ATTENDANCE_SNAPSHOT_CACHE: Optional[Dict[str, dict]] = None
+_PG_POOLS: Dict[str, object] = {}
+_PG_POOLS_PID: Optional[int] = None
+_PG_POOLS_LOCK = threading.Lock()
+_PG_UNREACHABLE: set = set()
+_READ_REPLICA_COUNTER = itertools.count()
+_READ_REPLICA_DOWN_UNTIL: Dict[int, float] = {}
+_SQLITE_READ_POOL: List[sqlite3.Connection] = []
+_SQLITE_READ_POOL_PID: Optional[int] = None
+_SQLITE_READ_POOL_LOCK = threading.Lock()
+_SQLITE_READ_POOL_STATS = {"opened": 0, "reused": 0, "returned": 0, "discarded": 0}
+_SQLITE_WAL_READY_PID: Optional[int] = None
+_SQLITE_WRITER = None
+_SQLITE_WRITER_LOCK = threading.Lock()
+_ATTENDANCE_UNIQUE_INDEX_PRESENT: Dict[str, bool] = {}
+_SYNC_JOB_EXECUTOR = None
+_SYNC_JOB_EXECUTOR_PID: Optional[int] = None
+_SYNC_JOB_EXECUTOR_LOCK = threading.Lock()
+_PROCESS_POOL = None
+_PROCESS_POOL_PID: Optional[int] = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _query_params_sample(params, limit: int = 10) -> Optional[str]:
+    if params is None:
+        return None
+    if isinstance(params, (list, tuple)) and len(params) > limit:
+        return f"{len(params)} values, first {limit}: {tuple(params[:limit])!r}"
+    return repr(params)[:200]
 
 
 class DBConnection:
-    def __init__(self, conn, backend: str):
+    def __init__(self, conn, backend: str, release=None):
         self._conn = conn
         self.backend = backend
+        self._release = release
+        self.query_count = 0
+        self.query_time = 0.0
+        self.slowest_query = None
+        self.slowest_query_time = 0.0
+        self.slowest_query_params = None
+        self._statement_runs: Dict[str, int] = {}
+
+    def reset_query_stats(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.slowest_query = None
+        self.slowest_query_time = 0.0
+        self.slowest_query_params = None
+        self._statement_runs = {}
+
+    def add_query_stats(self, count: int, elapsed: float):
+        self.query_count += count
+        self.query_time += elapsed
+
+    def _record_query(self, query: str, params, elapsed: float):
+        self.query_count += 1
+        self.query_time += elapsed
+        if elapsed >= self.slowest_query_time:
+            self.slowest_query_time = elapsed
+            self.slowest_query = query
+            self.slowest_query_params = _query_params_sample(params)
+        # Dynamic IN/VALUES lists make many distinct texts; only the first ones are tracked.
+        if query in self._statement_runs:
+            self._statement_runs[query] += 1
+        elif len(self._statement_runs) < DB_QUERY_STATS_MAX_STATEMENTS:
+            self._statement_runs[query] = 1
+
+    def repeated_queries(self):
+        return [
+            (" ".join(query.split()), runs)
+            for query, runs in self._statement_runs.items()
+            if DB_REPEATED_QUERY_THRESHOLD > 0 and runs >= DB_REPEATED_QUERY_THRESHOLD
+        ]
 
     @staticmethod
+    @lru_cache(maxsize=DATABASE_STATEMENT_CACHE_SIZE)
     def _convert_query(query: str):
         return query.replace("?", "%s")
 
-    def execute(self, query: str, params=None):
-        if self.backend == "postgres":
-            return self._conn.execute(self._convert_query(query), params)
-        return self._conn.execute(query, params or ())
+    def execute(self, query: str, params=None, prepare: bool = False):
+        started = time.perf_counter()
+        try:
+            if self.backend == "postgres":
+                # prepare=None leaves the decision to psycopg's prepare_threshold.
+                return self._conn.execute(
+                    self._convert_query(query),
+                    params,
+                    prepare=True if prepare and DATABASE_PREPARED_STATEMENTS else None,
+                )
+            return self._conn.execute(query, params or ())
+        finally:
+            self._record_query(query, params, time.perf_counter() - started)
 
     def executemany(self, query: str, seq_of_params):
-        if self.backend == "postgres":
+        started = time.perf_counter()
+        try:
+            if self.backend == "postgres":
+                with self._conn.cursor() as cur:
+                    return cur.executemany(self._convert_query(query), seq_of_params)
+            return self._conn.executemany(query, seq_of_params)
+        finally:
+            self._record_query(query, None, time.perf_counter() - started)
+
+    def copy_rows(self, statement: str, rows):
+        started = time.perf_counter()
+        try:
             with self._conn.cursor() as cur:
-                return cur.executemany(self._convert_query(query), seq_of_params)
-        return self._conn.executemany(query, seq_of_params)
+                with cur.copy(statement) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+        finally:
+            self._record_query(statement, None, time.perf_counter() - started)
 
     def executescript(self, script: str):
         if self.backend == "postgres":
             with self._conn.cursor() as cur:
                 cur.execute(script)
             return None
-        return self._conn.executescript(script)
+        # sqlite3's executescript() commits first, so statements run one by one to stay
+        # inside the caller's transaction.
+        statement = ""
+        for part in script.split(";"):
+            statement += part + ";"
+            if sqlite3.complete_statement(statement):
+                if statement.strip(" \t\r\n;"):
+                    self.execute(statement)
+                statement = ""
+        return None
 
     def commit(self):
         self._conn.commit()
 
+    def rollback(self):
+        self._conn.rollback()
+
     def close(self):
+        if self._release is not None:
+            self._release(self._conn)
+            return
         self._conn.close()
 
 
@@ -171,33 +377,441 @@ def is_integrity_error(exc: Exception) -> bool:
     return bool(psycopg and isinstance(exc, psycopg.IntegrityError))
 
 
+def _pg_connect_kwargs(connect_timeout: Optional[float] = None):
+    kwargs = {"row_factory": dict_row}
+    if connect_timeout:
+        kwargs["connect_timeout"] = max(1, int(math.ceil(connect_timeout)))
+    if not DATABASE_PREPARED_STATEMENTS:
+        # Needed behind transaction-mode poolers that cannot keep prepared statements.
+        kwargs["prepare_threshold"] = None
+    return kwargs
+
+
+def _get_pg_pool(conninfo: str, name: str, timeout: Optional[float] = None):
+    global _PG_POOLS, _PG_POOLS_PID
+    if not DATABASE_POOL_ENABLED or ConnectionPool is None:
+        return None
+    with _PG_POOLS_LOCK:
+        # Pools must not be shared across forked gunicorn workers.
+        if _PG_POOLS_PID != os.getpid():
+            inherited = list(_PG_POOLS.values())
+            _PG_POOLS = {}
+            _PG_POOLS_PID = os.getpid()
+            for old_pool in inherited:
+                try:
+                    old_pool.close(timeout=1.0)
+                except Exception:
+                    pass
+        pool = _PG_POOLS.get(name)
+        if pool is None:
+            pool = ConnectionPool(
+                conninfo,
+                kwargs=_pg_connect_kwargs(timeout),
+                min_size=max(0, DATABASE_POOL_MIN_SIZE),
+                max_size=max(1, DATABASE_POOL_MIN_SIZE, DATABASE_POOL_MAX_SIZE),
+                max_idle=DATABASE_POOL_MAX_IDLE,
+                max_lifetime=DATABASE_POOL_MAX_LIFETIME,
+                timeout=timeout or DATABASE_POOL_TIMEOUT,
+                check=ConnectionPool.check_connection if DATABASE_POOL_CHECK else None,
+                name=f"attendance-{name}-{os.getpid()}",
+                open=True,
+            )
+            _PG_POOLS[name] = pool
+        return pool
+
+
+def _release_pg_connection(pool, conn):
+    try:
+        # Uncommitted work is discarded, same as closing a dedicated connection.
+        conn.rollback()
+    except Exception:
+        pass
+    pool.putconn(conn)
+
+
+def get_db_pool_stats():
+    stats = {"backend": "postgres" if DATABASE_URL else "sqlite", "pid": os.getpid()}
+    cache_info = DBConnection._convert_query.cache_info()
+    stats["statement_cache"] = {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+        "prepared_statements": DATABASE_PREPARED_STATEMENTS,
+    }
+    if _PG_POOLS and _PG_POOLS_PID == os.getpid():
+        stats["postgres_pools"] = {name: pool.get_stats() for name, pool in _PG_POOLS.items()}
+    if SQLITE_PERFORMANCE_PROFILE:
+        with _SQLITE_READ_POOL_LOCK:
+            idle = len(_SQLITE_READ_POOL) if _SQLITE_READ_POOL_PID == os.getpid() else 0
+            stats["sqlite_read_pool"] = {
+                **_SQLITE_READ_POOL_STATS,
+                "idle": idle,
+                "max_size": SQLITE_READ_POOL_SIZE,
+            }
+    if _SQLITE_WRITER is not None and _SQLITE_WRITER.pid == os.getpid():
+        stats["sqlite_writer"] = _SQLITE_WRITER.get_stats()
+    return stats
+
+
+def _probe_postgres(conninfo: str, name: str):
+    # Raises psycopg.OperationalError when the server cannot be reached at all.
+    try:
+        psycopg.connect(conninfo, connect_timeout=max(1, int(math.ceil(DATABASE_CONNECT_TIMEOUT)))).close()
+    except Exception:
+        _PG_UNREACHABLE.add(name)
+        raise
+    _PG_UNREACHABLE.discard(name)
+
+
+def _connect_postgres(conninfo: Optional[str] = None, name: str = "primary", timeout: Optional[float] = None):
+    conninfo = conninfo or DATABASE_URL
+    pool = _get_pg_pool(conninfo, name, timeout)
+    if pool is None:
+        conn = psycopg.connect(conninfo, **_pg_connect_kwargs(timeout))
+        return DBConnection(conn, backend="postgres")
+    if name in _PG_UNREACHABLE:
+        # Down at the last attempt: check directly instead of waiting out the pool timeout again.
+        _probe_postgres(conninfo, name)
+    try:
+        conn = pool.getconn()
+    except PoolTimeout:
+        # The pool also times out when the server is down. Only a reachable server that has
+        # no free connection keeps the PoolTimeout (503); otherwise the probe raises.
+        _probe_postgres(conninfo, name)
+        raise
+    return DBConnection(
+        conn,
+        backend="postgres",
+        release=lambda c: _release_pg_connection(pool, c),
+    )
+
+
+def _is_read_only_request() -> bool:
+    return has_request_context() and request.method in {"GET", "HEAD", "OPTIONS"}
+
+
+def _apply_sqlite_pragmas(conn):
+    if SQLITE_SYNCHRONOUS in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+        conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size = {max(0, SQLITE_MMAP_SIZE)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def _open_sqlite_connection(read_only: bool = False):
+    global _SQLITE_WAL_READY_PID
+    db_dir = os.path.dirname(DB_PATH)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=ro",
+            uri=True,
+            timeout=60,
+            check_same_thread=False,
+            cached_statements=DATABASE_STATEMENT_CACHE_SIZE,
+        )
+    else:
+        conn = sqlite3.connect(
+            DB_PATH, timeout=60, cached_statements=DATABASE_STATEMENT_CACHE_SIZE
+        )
+    conn.row_factory = sqlite3.Row
+    if SQLITE_PERFORMANCE_PROFILE:
+        # journal_mode is stored in the database file, so one switch per worker is enough.
+        if not read_only and _SQLITE_WAL_READY_PID != os.getpid():
+            conn.execute("PRAGMA journal_mode = WAL")
+            _SQLITE_WAL_READY_PID = os.getpid()
+        _apply_sqlite_pragmas(conn)
+    return conn
+
+
+def _acquire_sqlite_read_connection():
+    global _SQLITE_READ_POOL, _SQLITE_READ_POOL_PID
+    with _SQLITE_READ_POOL_LOCK:
+        if _SQLITE_READ_POOL_PID != os.getpid():
+            _SQLITE_READ_POOL = []
+            _SQLITE_READ_POOL_PID = os.getpid()
+        if _SQLITE_READ_POOL:
+            _SQLITE_READ_POOL_STATS["reused"] += 1
+            return _SQLITE_READ_POOL.pop()
+        _SQLITE_READ_POOL_STATS["opened"] += 1
+    return _open_sqlite_connection(read_only=True)
+
+
+def _release_sqlite_read_connection(conn):
+    try:
+        conn.rollback()
+    except Exception:
+        conn.close()
+        return
+    with _SQLITE_READ_POOL_LOCK:
+        if _SQLITE_READ_POOL_PID == os.getpid() and len(_SQLITE_READ_POOL) < SQLITE_READ_POOL_SIZE:
+            _SQLITE_READ_POOL.append(conn)
+            _SQLITE_READ_POOL_STATS["returned"] += 1
+            return
+        _SQLITE_READ_POOL_STATS["discarded"] += 1
+    conn.close()
+
+
+def _connect_sqlite():
+    if (
+        SQLITE_PERFORMANCE_PROFILE
+        and SQLITE_READ_POOL_SIZE > 0
+        and _SQLITE_WAL_READY_PID == os.getpid()
+        and _is_read_only_request()
+    ):
+        conn = _acquire_sqlite_read_connection()
+        return DBConnection(conn, backend="sqlite", release=_release_sqlite_read_connection)
+    return DBConnection(_open_sqlite_connection(), backend="sqlite")
+
+
+class SQLiteWriter:
+    def __init__(self):
+        self.pid = os.getpid()
+        self._queue = queue.Queue()
+        self._lock_path = f"{DB_PATH}.write.lock"
+        self._state_lock = threading.Lock()
+        self.error: Optional[BaseException] = None
+        self.stats = {"batches": 0, "transactions": 0, "failed": 0, "largest_batch": 0}
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self.error is None and self._thread.is_alive()
+
+    def get_stats(self):
+        return {**self.stats, "queued": self._queue.qsize(), "alive": self.is_alive()}
+
+    def submit(self, fn):
+        future = Future()
+        with self._state_lock:
+            if self.error is not None:
+                raise RuntimeError(f"The SQLite writer stopped: {self.error}") from self.error
+            self._queue.put((fn, future))
+        try:
+            return future.result(timeout=SQLITE_WRITE_QUEUE_TIMEOUT)
+        except FutureTimeoutError:
+            pass
+        # Work that has not started yet is dropped; work already running gets one more timeout.
+        if future.cancel():
+            raise RuntimeError("Timed out waiting for the SQLite writer.")
+        try:
+            return future.result(timeout=SQLITE_WRITE_QUEUE_TIMEOUT)
+        except FutureTimeoutError:
+            raise RuntimeError("Timed out waiting for a queued SQLite write; it may still commit.") from None
+
+    @contextmanager
+    def _file_lock(self, lock_file):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + SQLITE_WRITE_QUEUE_WINDOW_MS / 1000
+        while len(batch) < max(1, SQLITE_WRITE_QUEUE_MAX_BATCH):
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return [item for item in batch if item[1].set_running_or_notify_cancel()]
+
+    def _run(self):
+        batch = []
+        try:
+            conn = _open_sqlite_connection()
+            conn.isolation_level = None
+            db = DBConnection(conn, backend="sqlite")
+            with open(self._lock_path, "a+") as lock_file:
+                while True:
+                    batch = self._collect_batch()
+                    if batch:
+                        with self._file_lock(lock_file):
+                            self._apply_batch(db, batch)
+        except BaseException as exc:
+            app.logger.exception("SQLite writer stopped")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"The SQLite writer stopped: {exc}"))
+            self._stop(exc)
+
+    def _stop(self, exc: BaseException):
+        # Queued writes fail now instead of waiting out their timeout; the next
+        # run_write_transaction starts a fresh writer.
+        with self._state_lock:
+            self.error = exc
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError(f"The SQLite writer stopped: {exc}"))
+
+    def _apply_batch(self, db, batch):
+        outcomes = []
+        db.reset_query_stats()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                db.execute("SAVEPOINT queued_write")
+                try:
+                    outcomes.append((future, fn(db), None))
+                    db.execute("RELEASE SAVEPOINT queued_write")
+                except Exception as exc:
+                    db.execute("ROLLBACK TO SAVEPOINT queued_write")
+                    db.execute("RELEASE SAVEPOINT queued_write")
+                    outcomes.append((future, None, exc))
+            db.execute("COMMIT")
+        except Exception as exc:
+            try:
+                db.execute("ROLLBACK")
+            except Exception:
+                pass
+            self.stats["failed"] += len(batch)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["transactions"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for future, result, exc in outcomes:
+            if exc is not None:
+                self.stats["failed"] += 1
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+def _get_sqlite_writer():
+    global _SQLITE_WRITER
+    with _SQLITE_WRITER_LOCK:
+        if _SQLITE_WRITER is None or _SQLITE_WRITER.pid != os.getpid() or not _SQLITE_WRITER.is_alive():
+            _SQLITE_WRITER = SQLiteWriter()
+        return _SQLITE_WRITER
+
+
+def run_write_transaction(fn):
+    db = get_db()
+    if db.backend == "sqlite" and SQLITE_WRITE_QUEUE:
+        # Queries run on the writer's connection are added to this request's totals.
+        usage = {}
+
+        def counted(writer_db):
+            count, elapsed = writer_db.query_count, writer_db.query_time
+            try:
+                return fn(writer_db)
+            finally:
+                usage["count"] = writer_db.query_count - count
+                usage["time"] = writer_db.query_time - elapsed
+
+        try:
+            return _get_sqlite_writer().submit(counted)
+        finally:
+            db.add_query_stats(usage.get("count", 0), usage.get("time", 0.0))
+    try:
+        result = fn(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _mark_recent_write()
+    return result
+
+
+def _should_use_read_replica() -> bool:
+    if not DATABASE_READ_URLS or not has_request_context():
+        return False
+    if request.method not in {"GET", "HEAD"} or request.endpoint not in READ_REPLICA_ENDPOINTS:
+        return False
+    # Users who just wrote something keep reading from the primary until replicas catch up.
+    return int(session.get("db_primary_until", 0)) <= time.time()
+
+
+def _connect_read_replica():
+    start = next(_READ_REPLICA_COUNTER)
+    last_error = None
+    for offset in range(len(DATABASE_READ_URLS)):
+        index = (start + offset) % len(DATABASE_READ_URLS)
+        # A replica that just failed is skipped instead of costing every request a timeout.
+        if _READ_REPLICA_DOWN_UNTIL.get(index, 0) > time.monotonic():
+            continue
+        try:
+            db = _connect_postgres(DATABASE_READ_URLS[index], f"replica-{index + 1}", DATABASE_READ_CONNECT_TIMEOUT)
+        except Exception as exc:
+            last_error = exc
+            _READ_REPLICA_DOWN_UNTIL[index] = time.monotonic() + DATABASE_READ_RETRY_SECONDS
+            app.logger.warning(
+                "Read replica %d unavailable, skipping it for %.0fs: %s",
+                index + 1,
+                DATABASE_READ_RETRY_SECONDS,
+                exc,
+            )
+            continue
+        _READ_REPLICA_DOWN_UNTIL.pop(index, None)
+        return db
+    raise last_error or RuntimeError("No read replica is available.")
+
+
+def _mark_recent_write():
+    # Bearer-token API clients have no session to pin to the primary.
+    if DATABASE_READ_URLS and has_request_context() and not _extract_bearer_token():
+        session["db_primary_until"] = int(time.time()) + DATABASE_READ_YOUR_WRITES_SECONDS
+
+
+def _is_sqlite_fallback_error(exc: Exception) -> bool:
+    # _connect_postgres only lets PoolTimeout through when PostgreSQL is up but saturated;
+    # sending those writes to the local file would lose them.
+    if PoolTimeout is not None and isinstance(exc, PoolTimeout):
+        return False
+    return isinstance(exc, (psycopg.OperationalError, psycopg.InterfaceError, psycopg.ProgrammingError))
+
+
 def get_db():
     if "db" not in g:
         if DATABASE_URL:
             if psycopg is None:
                 raise RuntimeError("DATABASE_URL is set, but psycopg is not installed.")
             try:
-                conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-                g.db = DBConnection(conn, backend="postgres")
-            except Exception:
-                if not DATABASE_FALLBACK_SQLITE:
+                db = None
+                if _should_use_read_replica():
+                    try:
+                        db = _connect_read_replica()
+                    except Exception:
+                        db = None
+                g.db = db or _connect_postgres()
+            except Exception as exc:
+                if not DATABASE_FALLBACK_SQLITE or not _is_sqlite_fallback_error(exc):
                     raise
-                db_dir = os.path.dirname(DB_PATH)
-                if db_dir:
-                    os.makedirs(db_dir, exist_ok=True)
-                conn = sqlite3.connect(DB_PATH, timeout=60)
-                conn.row_factory = sqlite3.Row
-                g.db = DBConnection(conn, backend="sqlite")
+                app.logger.warning("PostgreSQL unavailable, using SQLite instead: %s", exc)
+                g.db = _connect_sqlite()
         else:
-            db_dir = os.path.dirname(DB_PATH)
-            if db_dir:
-                os.makedirs(db_dir, exist_ok=True)
-            conn = sqlite3.connect(DB_PATH, timeout=60)
-            conn.row_factory = sqlite3.Row
-            g.db = DBConnection(conn, backend="sqlite")
+            g.db = _connect_sqlite()
     return g.db
 
 
+if PoolTimeout is not None:
+
+    @app.errorhandler(PoolTimeout)
+    def database_busy(exc):
+        app.logger.warning("%s %s: no database connection available: %s", request.method, request.path, exc)
+        headers = {"Retry-After": "5"}
+        if request.path.startswith("/api/"):
+            return jsonify({"ok": False, "error": "Database is busy, please retry"}), 503, headers
+        return "Database is busy, please retry shortly.", 503, headers
+
+
 @app.teardown_appcontext
 def close_db(exception):
     db = g.pop("db", None)
@@ -205,11 +819,53 @@ def close_db(exception):
         db.close()
 
 
+@app.after_request
+def report_db_queries(response):
+    db = g.get("db")
+    if db is None:
+        return response
+
+    if DB_QUERY_BUDGET > 0 and db.query_count > DB_QUERY_BUDGET:
+        app.logger.warning(
+            "%s %s issued %d queries in %.1f ms (budget %d); slowest %.1f ms: %s params %s",
+            request.method,
+            request.path,
+            db.query_count,
+            db.query_time * 1000,
+            DB_QUERY_BUDGET,
+            db.slowest_query_time * 1000,
+            " ".join((db.slowest_query or "").split())[:200],
+            db.slowest_query_params,
+        )
+    for query, runs in db.repeated_queries():
+        app.logger.warning(
+            "%s %s ran the same query %d times (possible N+1): %s",
+            request.method,
+            request.path,
+            runs,
+            query[:200],
+        )
+    if DB_QUERY_DEBUG_HEADER:
+        response.headers["X-DB-Queries"] = str(db.query_count)
+        response.headers["X-DB-Query-Time-Ms"] = f"{db.query_time * 1000:.2f}"
+        if db.slowest_query:
+            response.headers["X-DB-Slowest-Query-Ms"] = f"{db.slowest_query_time * 1000:.2f}"
+            response.headers["X-DB-Slowest-Query"] = " ".join(db.slowest_query.split())[:200]
+    return response
+
+
 @app.context_processor
 def inject_global_template_vars():
     return {"college_name": COLLEGE_NAME}
 
 
+@app.template_filter("timestamp")
+def format_timestamp(value):
+    if not value:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(int(value)))
+
+
 @app.before_request
 def normalize_legacy_session():
     if "role" not in session and "student_id" in session:
@@ -238,7 +894,9 @@ def get_logged_in_teacher(db):
     teacher_id = get_logged_in_teacher_id()
     if not teacher_id:
         return None
-    return db.execute("SELECT * FROM teachers WHERE id = ?", (teacher_id,)).fetchone()
+    return db.execute(
+        "SELECT * FROM teachers WHERE id = ?", (teacher_id,), prepare=True
+    ).fetchone()
 
 
 def _extract_bearer_token():
@@ -272,151 +930,727 @@ def _safe_attendance_status(value):
     return 1 if as_text in {"1", "true", "present", "p"} else 0
 
 
-def _upsert_students_from_sync(db, students_payload):
-    inserted = 0
-    updated = 0
+def _chunked(items, size: int):
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _process_context():
+    # Not fork: the web process has pool, writer and executor threads that a forked child would inherit mid-flight.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_process_pool():
+    # One pool per process, created on first use and shared by password hashing and DOCX parsing.
+    global _PROCESS_POOL, _PROCESS_POOL_PID
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None or _PROCESS_POOL_PID != os.getpid():
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=max(1, PASSWORD_HASH_WORKERS, DOCX_PARSE_WORKERS),
+                mp_context=_process_context(),
+            )
+            _PROCESS_POOL_PID = os.getpid()
+        return _PROCESS_POOL
+
+
+@atexit.register
+def _shutdown_process_pool():
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool = _PROCESS_POOL
+        _PROCESS_POOL = None
+    if pool is not None and _PROCESS_POOL_PID == os.getpid():
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _process_map(fn, items, workers: int) -> list:
+    global _PROCESS_POOL
+    items = list(items)
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+
+    pool = _get_process_pool()
+    try:
+        return list(pool.map(fn, items, chunksize=max(1, len(items) // (workers * 4))))
+    except BrokenProcessPool:
+        app.logger.warning("Process pool died; running %d items in this process", len(items))
+        with _PROCESS_POOL_LOCK:
+            if _PROCESS_POOL is pool:
+                _PROCESS_POOL = None
+        return [fn(item) for item in items]
+
+
+def hash_passwords(passwords) -> List[str]:
+    passwords = list(passwords)
+    if len(passwords) < PASSWORD_HASH_PARALLEL_MIN:
+        return [generate_password_hash(password) for password in passwords]
+    return _process_map(generate_password_hash, passwords, PASSWORD_HASH_WORKERS)
+
+
+def hash_default_passwords(roll_numbers) -> Dict[str, str]:
+    roll_numbers = list(dict.fromkeys(roll_numbers))
+    if DEFAULT_PASSWORD_PENDING:
+        return {roll_no: PENDING_PASSWORD_HASH for roll_no in roll_numbers}
+    return dict(zip(roll_numbers, hash_passwords(roll_numbers)))
+
+
+def check_student_password(student, password: str) -> bool:
+    password_hash = student["password_hash"]
+    if password_hash != PENDING_PASSWORD_HASH:
+        return bool(password_hash) and check_password_hash(password_hash, password)
+    if not hmac.compare_digest(password.encode(), student["roll_no"].encode()):
+        return False
+
+    new_hash = generate_password_hash(password)
+    run_write_transaction(
+        lambda db: db.execute(
+            "UPDATE students SET password_hash = ? WHERE id = ? AND password_hash = ?",
+            (new_hash, student["id"], PENDING_PASSWORD_HASH),
+        )
+    )
+    return True
+
+
+def hash_pending_passwords(db, limit: int = 500) -> int:
+    pending = db.execute(
+        "SELECT id, roll_no FROM students WHERE password_hash = ? ORDER BY id LIMIT ?",
+        (PENDING_PASSWORD_HASH, limit),
+    ).fetchall()
+    db.rollback()
+    if not pending:
+        return 0
+
+    hashes = hash_passwords(row["roll_no"] for row in pending)
+    run_write_transaction(
+        lambda db: db.executemany(
+            "UPDATE students SET password_hash = ? WHERE id = ? AND password_hash = ?",
+            [(password_hash, row["id"], PENDING_PASSWORD_HASH) for row, password_hash in zip(pending, hashes)],
+        )
+    )
+    return len(pending)
+
+
+def _insert_values_many(db, insert_sql: str, rows, suffix: str = ""):
+    rows = list(rows)
+    if not rows:
+        return
+    width = len(rows[0])
+    row_placeholder = "(" + ", ".join("?" for _ in range(width)) + ")"
+    for chunk in _chunked(rows, max(1, SQL_MAX_PARAMETERS // width)):
+        db.execute(
+            f"{insert_sql} {', '.join(row_placeholder for _ in chunk)} {suffix}",
+            tuple(value for row in chunk for value in row),
+        )
+
+
+def _existing_roll_numbers(db, roll_numbers):
+    existing = {}
+    for chunk in _chunked(sorted(set(roll_numbers)), SQL_MAX_PARAMETERS):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = db.execute(
+            f"SELECT id, roll_no FROM students WHERE roll_no IN ({placeholders})",
+            tuple(chunk),
+        ).fetchall()
+        existing.update((row["roll_no"], row["id"]) for row in rows)
+    return existing
+
+
+def _sync_item_label(key: str, index: int, by_line: bool) -> str:
+    return f"line {index}" if by_line else f"{key}[{index}]"
+
+
+# A sync payload is a list of records, or a columnar {field: [values]} dict from _decode_columnar_payload.
+def _sync_length(payload) -> int:
+    if isinstance(payload, dict):
+        return len(next(iter(payload.values()), []))
+    return len(payload)
+
+
+def _sync_slice(payload, start: int, stop: int):
+    if isinstance(payload, dict):
+        return {field: column[start:stop] for field, column in payload.items()}
+    return payload[start:stop]
+
+
+def _sync_field_rows(payload, fields, start: int = 1, lines: Optional[List[int]] = None):
+    # Yields (position, values of fields) per item, values being None for an item that is not an object.
+    # Items are numbered from start, or by NDJSON line number for streamed uploads.
+    if isinstance(payload, dict):
+        length = _sync_length(payload)
+        rows = zip(*(payload.get(field) or itertools.repeat(None, length) for field in fields))
+    else:
+        rows = (
+            tuple(item.get(field) for field in fields) if isinstance(item, dict) else None
+            for item in payload
+        )
+    if lines is not None:
+        return zip(lines, rows)
+    return enumerate(rows, start=start)
+
+
+def _validate_sync_students(students_payload, start: int = 1, lines: Optional[List[int]] = None):
+    valid = []
     skipped = 0
     errors = []
 
-    for index, item in enumerate(students_payload, start=1):
-        if not isinstance(item, dict):
+    fields = ("roll_no", "first_name", "last_name", "name", "email", "department", "semester")
+    for index, values in _sync_field_rows(students_payload, fields, start, lines):
+        label = _sync_item_label("students", index, lines is not None)
+        if values is None:
             skipped += 1
-            errors.append(f"students[{index}] is not an object")
+            errors.append((index, f"{label} is not an object"))
             continue
 
-        roll_no = _safe_text(item.get("roll_no"))
+        roll_no, first_name, last_name, full_name, email, department, semester = values
+        roll_no = _safe_text(roll_no)
         if not roll_no:
             skipped += 1
-            errors.append(f"students[{index}] missing roll_no")
+            errors.append((index, f"{label} missing roll_no"))
             continue
 
-        first_name = _safe_text(item.get("first_name"))
-        last_name = _safe_text(item.get("last_name"))
-        full_name = _safe_text(item.get("name"))
+        first_name = _safe_text(first_name)
+        last_name = _safe_text(last_name)
+        full_name = _safe_text(full_name)
         if not full_name:
             full_name = " ".join(part for part in [first_name, last_name] if part).strip()
         if not full_name:
             full_name = roll_no
 
-        email = _safe_text(item.get("email")) or f"{roll_no.lower()}@college.local"
-        department = _safe_text(item.get("department"))
-        semester = _safe_text(item.get("semester"))
+        valid.append(
+            {
+                "roll_no": roll_no,
+                "name": full_name,
+                "first_name": first_name or None,
+                "last_name": last_name or None,
+                "email": _safe_text(email) or f"{roll_no.lower()}@college.local",
+                "department": _safe_text(department) or None,
+                "semester": _safe_text(semester) or None,
+            }
+        )
 
-        existing = db.execute(
-            "SELECT id FROM students WHERE roll_no = ?",
-            (roll_no,),
-        ).fetchone()
+    return valid, skipped, errors
 
-        if existing:
-            db.execute(
-                """
-                UPDATE students
-                SET name = ?, first_name = ?, last_name = ?, email = ?, department = ?, semester = ?
-                WHERE id = ?
-                """,
-                (
-                    full_name,
-                    first_name or None,
-                    last_name or None,
-                    email,
-                    department or None,
-                    semester or None,
-                    existing["id"],
-                ),
-            )
+
+def _use_copy_sync(db, rows) -> bool:
+    return db.backend == "postgres" and SYNC_COPY_THRESHOLD > 0 and len(rows) >= SYNC_COPY_THRESHOLD
+
+
+def _copy_students_from_sync(db, valid, passwords: Optional[Dict[str, str]] = None):
+    existing = {
+        row["roll_no"]
+        for row in db.execute(
+            "SELECT roll_no FROM students WHERE roll_no = ANY(?)",
+            (list({student["roll_no"] for student in valid}),),
+        ).fetchall()
+    }
+    inserted = 0
+    updated = 0
+    latest = {}
+    for student in valid:
+        if student["roll_no"] in existing or student["roll_no"] in latest:
             updated += 1
         else:
-            db.execute(
-                """
-                INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    full_name,
-                    first_name or None,
-                    last_name or None,
-                    roll_no,
-                    email,
-                    generate_password_hash(roll_no),
-                    department or None,
-                    semester or None,
-                ),
-            )
             inserted += 1
+        latest[student["roll_no"]] = student
+    new_passwords = _new_student_passwords([roll_no for roll_no in latest if roll_no not in existing], passwords)
+
+    db.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS sync_students_stage (
+            name TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            roll_no TEXT,
+            email TEXT,
+            password_hash TEXT,
+            department TEXT,
+            semester TEXT
+        ) ON COMMIT DROP
+        """
+    )
+    db.execute("TRUNCATE sync_students_stage")
+    db.copy_rows(
+        """
+        COPY sync_students_stage(
+            name, first_name, last_name, roll_no, email, password_hash, department, semester
+        ) FROM STDIN
+        """,
+        (
+            (
+                student["name"],
+                student["first_name"],
+                student["last_name"],
+                roll_no,
+                student["email"],
+                new_passwords.get(roll_no),
+                student["department"],
+                student["semester"],
+            )
+            for roll_no, student in latest.items()
+        ),
+    )
+    db.execute(
+        """
+        INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester)
+        SELECT name, first_name, last_name, roll_no, email, password_hash, department, semester
+        FROM sync_students_stage
+        ON CONFLICT(roll_no) DO UPDATE SET
+            name = excluded.name,
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            email = excluded.email,
+            department = excluded.department,
+            semester = excluded.semester
+        """
+    )
+    return inserted, updated
 
-    return {"inserted": inserted, "updated": updated, "skipped": skipped, "errors": errors}
 
+def sync_default_passwords(db, students_payload) -> Dict[str, str]:
+    # Run before the write transaction, so the SQLite writer thread (and the write lock) never waits on scrypt.
+    roll_numbers = {
+        _safe_text(values[0]) for _, values in _sync_field_rows(students_payload, ("roll_no",)) if values
+    } - {""}
+    existing = _existing_roll_numbers(db, roll_numbers)
+    return hash_default_passwords(sorted(roll_numbers - set(existing)))
+
+
+def _new_student_passwords(roll_numbers, passwords: Optional[Dict[str, str]]) -> Dict[str, str]:
+    if passwords is None:
+        return hash_default_passwords(roll_numbers)
+    # A student deleted by another writer after the passwords were hashed is stored as pending.
+    return {roll_no: passwords.get(roll_no, PENDING_PASSWORD_HASH) for roll_no in roll_numbers}
+
+
+def _upsert_students_from_sync(
+    db,
+    students_payload,
+    start: int = 1,
+    lines: Optional[List[int]] = None,
+    passwords: Optional[Dict[str, str]] = None,
+):
+    valid, skipped, errors = _validate_sync_students(students_payload, start, lines)
+    if _use_copy_sync(db, valid):
+        inserted, updated = _copy_students_from_sync(db, valid, passwords)
+        return {"inserted": inserted, "updated": updated, "skipped": skipped, "errors": errors}
 
-def _insert_attendance_from_sync(db, attendance_payload):
     inserted = 0
     updated = 0
+
+    for chunk in _chunked(valid, max(1, SYNC_CHUNK_SIZE)):
+        existing = _existing_roll_numbers(db, [student["roll_no"] for student in chunk])
+        # Later entries for the same roll_no win, exactly as with one statement per entry.
+        latest = {}
+        for student in chunk:
+            if student["roll_no"] in existing or student["roll_no"] in latest:
+                updated += 1
+            else:
+                inserted += 1
+            latest[student["roll_no"]] = student
+        new_passwords = _new_student_passwords(
+            [roll_no for roll_no in latest if roll_no not in existing], passwords
+        )
+
+        _insert_values_many(
+            db,
+            "INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester) VALUES",
+            [
+                (
+                    student["name"],
+                    student["first_name"],
+                    student["last_name"],
+                    roll_no,
+                    student["email"],
+                    new_passwords.get(roll_no),
+                    student["department"],
+                    student["semester"],
+                )
+                for roll_no, student in latest.items()
+            ],
+            """
+            ON CONFLICT(roll_no) DO UPDATE SET
+                name = excluded.name,
+                first_name = excluded.first_name,
+                last_name = excluded.last_name,
+                email = excluded.email,
+                department = excluded.department,
+                semester = excluded.semester
+            """,
+        )
+
+    return {"inserted": inserted, "updated": updated, "skipped": skipped, "errors": errors}
+
+
+def _validate_sync_attendance(attendance_payload, start: int = 1, lines: Optional[List[int]] = None):
+    valid = []
     skipped = 0
     errors = []
 
-    for index, item in enumerate(attendance_payload, start=1):
-        if not isinstance(item, dict):
+    fields = ("roll_no", "subject", "attendance_date", "status")
+    for index, values in _sync_field_rows(attendance_payload, fields, start, lines):
+        label = _sync_item_label("attendance", index, lines is not None)
+        if values is None:
             skipped += 1
-            errors.append(f"attendance[{index}] is not an object")
+            errors.append((index, f"{label} is not an object"))
             continue
 
-        roll_no = _safe_text(item.get("roll_no"))
-        subject = _safe_text(item.get("subject"))
-        attendance_date = _safe_text(item.get("attendance_date")) or date.today().isoformat()
-        status = _safe_attendance_status(item.get("status"))
+        roll_no, subject, attendance_date, status = values
+        roll_no = _safe_text(roll_no)
+        subject = _safe_text(subject)
+        attendance_date = _safe_text(attendance_date) or date.today().isoformat()
+        status = _safe_attendance_status(status)
 
         if not roll_no or not subject:
             skipped += 1
-            errors.append(f"attendance[{index}] missing roll_no or subject")
-            continue
-
-        student = db.execute(
-            "SELECT id FROM students WHERE roll_no = ?",
-            (roll_no,),
-        ).fetchone()
-        if not student:
-            skipped += 1
-            errors.append(f"attendance[{index}] roll_no {roll_no} not found")
+            errors.append((index, f"{label} missing roll_no or subject"))
             continue
 
-        existing = db.execute(
-            """
-            SELECT id
-            FROM attendance_records
-            WHERE student_id = ? AND attendance_date = ? AND subject = ?
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (student["id"], attendance_date, subject),
-        ).fetchone()
-
-        if existing:
-            db.execute(
-                "UPDATE attendance_records SET status = ? WHERE id = ?",
-                (status, existing["id"]),
-            )
-            updated += 1
-        else:
-            db.execute(
-                """
-                INSERT INTO attendance_records(student_id, attendance_date, subject, status)
-                VALUES (?, ?, ?, ?)
-                """,
-                (student["id"], attendance_date, subject, status),
-            )
-            inserted += 1
+        valid.append((index, roll_no, attendance_date, subject, status))
 
-    return {"inserted": inserted, "updated": updated, "skipped": skipped, "errors": errors}
+    return valid, skipped, errors
 
 
-def is_admin_teacher(db):
-    teacher = get_logged_in_teacher(db)
-    if not teacher:
-        return False
-    return teacher["username"].strip().lower() == ADMIN_TEACHER_USERNAME
+def _existing_attendance_keys(db, keys):
+    found = {}
+    for chunk in _chunked(sorted(keys), SQL_MAX_PARAMETERS // 3):
+        rows = db.execute(
+            f"""
+            WITH sync_keys(student_id, attendance_date, subject) AS (
+                VALUES {", ".join("(?, ?, ?)" for _ in chunk)}
+            )
+            SELECT ar.student_id, ar.attendance_date, ar.subject, MAX(ar.id) AS id
+            FROM sync_keys k
+            JOIN attendance_records ar
+              ON ar.student_id = k.student_id
+             AND ar.attendance_date = k.attendance_date
+             AND ar.subject = k.subject
+            GROUP BY ar.student_id, ar.attendance_date, ar.subject
+            """,
+            tuple(value for key in chunk for value in key),
+        ).fetchall()
+        for row in rows:
+            found[(row["student_id"], row["attendance_date"], row["subject"])] = row["id"]
+    return found
 
 
-def init_db():
-    db = get_db()
+def _copy_attendance_from_sync(db, valid, insert_suffix: str, by_line: bool = False):
+    db.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS sync_attendance_stage (
+            ord INTEGER,
+            roll_no TEXT,
+            attendance_date TEXT,
+            subject TEXT,
+            status INTEGER
+        ) ON COMMIT DROP
+        """
+    )
+    db.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS sync_attendance_keys (
+            student_id BIGINT,
+            attendance_date TEXT,
+            subject TEXT,
+            status INTEGER,
+            record_id BIGINT
+        ) ON COMMIT DROP
+        """
+    )
+    db.execute("TRUNCATE sync_attendance_stage, sync_attendance_keys")
+    db.copy_rows(
+        "COPY sync_attendance_stage(ord, roll_no, attendance_date, subject, status) FROM STDIN",
+        valid,
+    )
+    db.execute("ANALYZE sync_attendance_stage")
+
+    missing = db.execute(
+        """
+        SELECT st.ord, st.roll_no
+        FROM sync_attendance_stage st
+        LEFT JOIN students s ON s.roll_no = st.roll_no
+        WHERE s.id IS NULL
+        ORDER BY st.ord
+        """
+    ).fetchall()
+    # The last mark per key wins and updates the newest existing row, as on the row-by-row path.
+    db.execute(
+        """
+        INSERT INTO sync_attendance_keys(student_id, attendance_date, subject, status, record_id)
+        SELECT k.student_id, k.attendance_date, k.subject, k.status, (
+            SELECT MAX(ar.id)
+            FROM attendance_records ar
+            WHERE ar.student_id = k.student_id
+              AND ar.attendance_date = k.attendance_date
+              AND ar.subject = k.subject
+        )
+        FROM (
+            SELECT DISTINCT ON (s.id, st.attendance_date, st.subject)
+                s.id AS student_id, st.attendance_date, st.subject, st.status
+            FROM sync_attendance_stage st
+            JOIN students s ON s.roll_no = st.roll_no
+            ORDER BY s.id, st.attendance_date, st.subject, st.ord DESC
+        ) k
+        """
+    )
+    inserted = db.execute(
+        "SELECT COUNT(*) AS total FROM sync_attendance_keys WHERE record_id IS NULL"
+    ).fetchone()["total"]
+    db.execute(
+        """
+        UPDATE attendance_records ar
+        SET status = k.status
+        FROM sync_attendance_keys k
+        WHERE ar.id = k.record_id
+        """
+    )
+    db.execute(
+        f"""
+        INSERT INTO attendance_records(student_id, attendance_date, subject, status)
+        SELECT student_id, attendance_date, subject, status
+        FROM sync_attendance_keys
+        WHERE record_id IS NULL
+        ORDER BY student_id, attendance_date, subject
+        {insert_suffix}
+        """
+    )
+    touched_student_ids = {
+        row["student_id"]
+        for row in db.execute("SELECT DISTINCT student_id FROM sync_attendance_keys").fetchall()
+    }
+    updated = len(valid) - len(missing) - inserted
+    errors = [
+        (row["ord"], f"{_sync_item_label('attendance', row['ord'], by_line)} roll_no {row['roll_no']} not found")
+        for row in missing
+    ]
+    return inserted, updated, errors, touched_student_ids
+
+
+def _insert_attendance_from_sync(db, attendance_payload, start: int = 1, lines: Optional[List[int]] = None):
+    valid, skipped, errors = _validate_sync_attendance(attendance_payload, start, lines)
+    inserted = 0
+    updated = 0
+    touched_student_ids = set()
+
+    insert_suffix = ""
+    if _has_attendance_unique_index(db):
+        insert_suffix = f"""
+            ON CONFLICT(student_id, attendance_date, subject)
+            WHERE subject <> '{SYNTHESIZED_ATTENDANCE_SUBJECT}'
+            DO UPDATE SET status = excluded.status
+        """
+
+    if _use_copy_sync(db, valid):
+        inserted, updated, missing, touched_student_ids = _copy_attendance_from_sync(
+            db, valid, insert_suffix, lines is not None
+        )
+        refresh_attendance_summary(db, touched_student_ids)
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "skipped": skipped + len(missing),
+            "errors": sorted(errors + missing),
+        }
+
+    student_ids = _existing_roll_numbers(db, [item[1] for item in valid])
+
+    for chunk in _chunked(valid, max(1, SYNC_CHUNK_SIZE)):
+        resolved = []
+        for index, roll_no, attendance_date, subject, status in chunk:
+            student_id = student_ids.get(roll_no)
+            if student_id is None:
+                skipped += 1
+                label = _sync_item_label("attendance", index, lines is not None)
+                errors.append((index, f"{label} roll_no {roll_no} not found"))
+                continue
+            resolved.append(((student_id, attendance_date, subject), status))
+
+        existing = _existing_attendance_keys(db, {key for key, _ in resolved})
+        # Replays the per-mark rules in payload order: a key that already has a row
+        # (or was inserted earlier in this payload) is updated, otherwise it is inserted.
+        status_updates = {}
+        pending_inserts = {}
+        for key, status in resolved:
+            touched_student_ids.add(key[0])
+            if key in existing:
+                status_updates[existing[key]] = status
+                updated += 1
+            elif key in pending_inserts:
+                pending_inserts[key] = status
+                updated += 1
+            else:
+                pending_inserts[key] = status
+                inserted += 1
+
+        if status_updates:
+            db.executemany(
+                "UPDATE attendance_records SET status = ? WHERE id = ?",
+                [(status, record_id) for record_id, status in status_updates.items()],
+            )
+        _insert_values_many(
+            db,
+            "INSERT INTO attendance_records(student_id, attendance_date, subject, status) VALUES",
+            [key + (status,) for key, status in pending_inserts.items()],
+            insert_suffix,
+        )
+
+    refresh_attendance_summary(db, touched_student_ids)
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": skipped,
+        "errors": sorted(errors),
+    }
+
+
+def _has_attendance_unique_index(db) -> bool:
+    if db.backend not in _ATTENDANCE_UNIQUE_INDEX_PRESENT:
+        if db.backend == "postgres":
+            row = db.execute(
+                "SELECT 1 FROM pg_indexes WHERE indexname = ?",
+                (ATTENDANCE_UNIQUE_INDEX_NAME,),
+            ).fetchone()
+        else:
+            row = db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+                (ATTENDANCE_UNIQUE_INDEX_NAME,),
+            ).fetchone()
+        _ATTENDANCE_UNIQUE_INDEX_PRESENT[db.backend] = row is not None
+    return _ATTENDANCE_UNIQUE_INDEX_PRESENT[db.backend]
+
+
+def dedupe_attendance_records(db) -> int:
+    # Keeps the newest row per key, which is the row the sync API has been updating.
+    # Synthesised "Overall" rows hold several classes per day and are left alone.
+    duplicates = """
+        FROM attendance_records
+        WHERE subject <> ?
+          AND id NOT IN (
+              SELECT MAX(id)
+              FROM attendance_records
+              WHERE subject <> ?
+              GROUP BY student_id, attendance_date, subject
+          )
+    """
+    params = (SYNTHESIZED_ATTENDANCE_SUBJECT, SYNTHESIZED_ATTENDANCE_SUBJECT)
+    student_ids = [row["student_id"] for row in db.execute(f"SELECT DISTINCT student_id {duplicates}", params)]
+    deleted = db.execute(f"DELETE {duplicates}", params).rowcount
+    refresh_attendance_summary(db, student_ids)
+    return max(0, deleted or 0)
+
+
+def create_attendance_unique_index(db):
+    db.execute(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS {ATTENDANCE_UNIQUE_INDEX_NAME}
+        ON attendance_records(student_id, attendance_date, subject)
+        WHERE subject <> '{SYNTHESIZED_ATTENDANCE_SUBJECT}'
+        """
+    )
+    _ATTENDANCE_UNIQUE_INDEX_PRESENT.pop(db.backend, None)
+
+
+def is_admin_teacher(db, teacher=None):
+    if teacher is None:
+        teacher = get_logged_in_teacher(db)
+    if not teacher:
+        return False
+    return teacher["username"].strip().lower() == ADMIN_TEACHER_USERNAME
+
+
+def init_db():
+    db = get_db()
+    if _get_schema_version(db) < SCHEMA_MIGRATIONS[-1][0]:
+        with _schema_migration_lock(db):
+            _apply_schema_migrations(db)
+    _apply_boot_checks(db)
+
+
+def _apply_boot_checks(db):
+    # Not versioned: two indexed username lookups that must hold after every boot,
+    # e.g. when ADMIN_TEACHER_USERNAME changes or a seeded account is deleted.
+    try:
+        _seed_default_teacher(db)
+        _seed_admin_teacher(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _get_schema_version(db) -> int:
+    try:
+        row = db.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()
+    except Exception:
+        db.rollback()
+        return 0
+    return int(row["version"] or 0)
+
+
+@contextmanager
+def _schema_migration_lock(db):
+    if db.backend == "postgres":
+        db.execute("SELECT pg_advisory_lock(?)", (SCHEMA_MIGRATION_LOCK_ID,))
+        db.commit()
+        try:
+            yield
+        finally:
+            db.rollback()
+            db.execute("SELECT pg_advisory_unlock(?)", (SCHEMA_MIGRATION_LOCK_ID,))
+            db.commit()
+        return
+
+    if fcntl is None:
+        yield
+        return
+    with open(f"{DB_PATH}.migrate.lock", "a+") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _apply_schema_migrations(db):
+    id_type = "BIGINT" if db.backend == "postgres" else "INTEGER"
+    db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at {id_type} NOT NULL
+        )
+        """
+    )
+    db.commit()
+
+    # Another worker may have finished the migrations while this one waited for the lock.
+    current_version = _get_schema_version(db)
+    for version, name, migration in SCHEMA_MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            if db.backend == "sqlite":
+                # DDL does not open a transaction implicitly in sqlite3.
+                db.execute("BEGIN")
+            migration(db)
+            db.execute(
+                "INSERT INTO schema_version(version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, int(time.time())),
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        app.logger.info("Applied schema migration %d: %s", version, name)
+
+
+def _create_base_tables(db):
     if db.backend == "postgres":
         db.executescript(
             """
@@ -490,11 +1724,6 @@ def init_db():
             );
             """
         )
-    _migrate_students_table(db)
-    _migrate_teachers_table(db)
-    _seed_default_teacher(db)
-    _seed_admin_teacher(db)
-    db.commit()
 
 
 def _migrate_students_table(db):
@@ -542,13 +1771,16 @@ def _migrate_students_table(db):
         "CREATE INDEX IF NOT EXISTS idx_students_email ON students(email)"
     )
 
+
+def _backfill_student_defaults(db):
     students_without_password = db.execute(
         "SELECT id, roll_no FROM students WHERE password_hash IS NULL OR password_hash = ''"
     ).fetchall()
-    for row in students_without_password:
-        db.execute(
+    if students_without_password:
+        new_passwords = hash_default_passwords(row["roll_no"] for row in students_without_password)
+        db.executemany(
             "UPDATE students SET password_hash = ? WHERE id = ?",
-            (generate_password_hash(row["roll_no"]), row["id"]),
+            [(new_passwords[row["roll_no"]], row["id"]) for row in students_without_password],
         )
 
     students_without_email = db.execute(
@@ -573,7 +1805,8 @@ def _ensure_students_email_not_unique(db):
     if "EMAIL TEXT UNIQUE" not in sql_text:
         return
 
-    db.execute("PRAGMA foreign_keys = OFF")
+    # Runs inside the migration transaction, where PRAGMA foreign_keys cannot change; these
+    # connections never enable foreign key enforcement, so the rebuild needs no pragma.
     db.executescript(
         """
         CREATE TABLE students_new (
@@ -603,7 +1836,6 @@ def _ensure_students_email_not_unique(db):
         ALTER TABLE students_new RENAME TO students;
         """
     )
-    db.execute("PRAGMA foreign_keys = ON")
 
 
 def _seed_default_teacher(db):
@@ -617,21 +1849,20 @@ def _seed_default_teacher(db):
     if teacher:
         return
 
+    # Workers booting together may race to create the same teacher.
     db.execute(
         """
-        INSERT INTO teachers(name, username, password_hash)
-        VALUES (?, ?, ?)
+        INSERT INTO teachers(name, username, email, password_hash)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(username) DO NOTHING
         """,
         (
             "Default Faculty",
             DEFAULT_TEACHER_USERNAME,
+            DEFAULT_TEACHER_EMAIL,
             generate_password_hash(DEFAULT_TEACHER_PASSWORD),
         ),
     )
-    db.execute(
-        "UPDATE teachers SET email = ? WHERE username = ?",
-        (DEFAULT_TEACHER_EMAIL, DEFAULT_TEACHER_USERNAME),
-    )
 
 
 def _seed_admin_teacher(db):
@@ -647,19 +1878,17 @@ def _seed_admin_teacher(db):
 
     db.execute(
         """
-        INSERT INTO teachers(name, username, password_hash)
-        VALUES (?, ?, ?)
+        INSERT INTO teachers(name, username, email, password_hash)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(username) DO NOTHING
         """,
         (
             "Admin Faculty",
             ADMIN_TEACHER_USERNAME,
+            ADMIN_TEACHER_EMAIL,
             generate_password_hash(ADMIN_TEACHER_PASSWORD),
         ),
     )
-    db.execute(
-        "UPDATE teachers SET email = ? WHERE username = ?",
-        (ADMIN_TEACHER_EMAIL, ADMIN_TEACHER_USERNAME),
-    )
 
 
 def _migrate_teachers_table(db):
@@ -683,35 +1912,567 @@ def _migrate_teachers_table(db):
             db.execute("ALTER TABLE teachers ADD COLUMN reset_otp_expires INTEGER")
 
     db.execute(
-        "CREATE UNIQUE INDEX IF NOT EXISTS idx_teachers_username ON teachers(username)"
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_teachers_username ON teachers(username)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_teachers_email ON teachers(email)"
+    )
+
+
+def _backfill_teacher_emails(db):
+    teachers_without_email = db.execute(
+        "SELECT id, username FROM teachers WHERE email IS NULL OR email = ''"
+    ).fetchall()
+    for row in teachers_without_email:
+        generated_email = f"{row['username']}@college.local"
+        db.execute(
+            "UPDATE teachers SET email = ? WHERE id = ?",
+            (generated_email, row["id"]),
+        )
+
+
+def _backfill_account_defaults(db):
+    # Every write path fills these in; only rows from older schemas or edited outside the app lack them.
+    _backfill_student_defaults(db)
+    _backfill_teacher_emails(db)
+
+
+def _create_attendance_indexes(db):
+    db.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attendance_student_lookup
+        ON attendance_records(student_id, attendance_date, subject, status)
+        """
+    )
+
+
+def _create_attendance_summary_table(db):
+    id_type = "BIGINT" if db.backend == "postgres" else "INTEGER"
+    db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS student_attendance_summary (
+            student_id {id_type} PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+            total_classes INTEGER NOT NULL DEFAULT 0,
+            attended_classes INTEGER NOT NULL DEFAULT 0,
+            last_date TEXT,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    rebuild_attendance_summary(db)
+
+
+_ATTENDANCE_SUMMARY_UPSERT = """
+    INSERT INTO student_attendance_summary(
+        student_id, total_classes, attended_classes, last_date, version
+    )
+    SELECT
+        s.id,
+        COUNT(ar.id),
+        COALESCE(SUM(ar.status), 0),
+        MAX(ar.attendance_date),
+        1
+    FROM students s
+    LEFT JOIN attendance_records ar ON ar.student_id = s.id
+    WHERE {where}
+    GROUP BY s.id
+    ON CONFLICT(student_id) DO UPDATE SET
+        total_classes = excluded.total_classes,
+        attended_classes = excluded.attended_classes,
+        last_date = excluded.last_date,
+        version = student_attendance_summary.version + 1
+"""
+
+
+def refresh_attendance_summary(db, student_ids):
+    student_ids = sorted({int(student_id) for student_id in student_ids if student_id is not None})
+    for chunk in _chunked(student_ids, 500):
+        placeholders = ", ".join("?" for _ in chunk)
+        db.execute(
+            _ATTENDANCE_SUMMARY_UPSERT.format(where=f"s.id IN ({placeholders})"),
+            tuple(chunk),
+        )
+        _refresh_low_attendance_roster(db, chunk)
+
+
+def rebuild_attendance_summary(db):
+    db.execute(
+        """
+        DELETE FROM student_attendance_summary
+        WHERE student_id NOT IN (SELECT id FROM students)
+        """
+    )
+    db.execute(_ATTENDANCE_SUMMARY_UPSERT.format(where="1 = 1"))
+
+
+def _low_attendance_percentage(attended: int, total: int) -> Optional[float]:
+    if not total:
+        return None
+    percentage = (100.0 * attended) / total
+    if percentage >= MIN_PERCENTAGE:
+        return None
+    return round(percentage, 2)
+
+
+def _refresh_low_attendance_roster(db, student_ids, record_events: bool = True):
+    placeholders = ", ".join("?" for _ in student_ids)
+    previous = {
+        row["student_id"]
+        for row in db.execute(
+            f"SELECT student_id FROM low_attendance_roster WHERE student_id IN ({placeholders})",
+            tuple(student_ids),
+        ).fetchall()
+    }
+    summaries = db.execute(
+        f"""
+        SELECT student_id, total_classes, attended_classes
+        FROM student_attendance_summary
+        WHERE student_id IN ({placeholders})
+        """,
+        tuple(student_ids),
+    ).fetchall()
+
+    now_ts = int(time.time())
+    roster_rows = []
+    events = []
+    for row in summaries:
+        percentage = _low_attendance_percentage(row["attended_classes"], row["total_classes"])
+        is_low = percentage is not None
+        if is_low:
+            roster_rows.append(
+                (row["student_id"], row["attended_classes"], row["total_classes"], percentage, now_ts)
+            )
+        if is_low != (row["student_id"] in previous):
+            events.append(
+                (
+                    row["student_id"],
+                    "dropped_below" if is_low else "recovered",
+                    round((100.0 * row["attended_classes"]) / row["total_classes"], 2)
+                    if row["total_classes"]
+                    else 0.0,
+                    now_ts,
+                )
+            )
+
+    db.execute(
+        f"DELETE FROM low_attendance_roster WHERE student_id IN ({placeholders})",
+        tuple(student_ids),
+    )
+    if roster_rows:
+        db.executemany(
+            """
+            INSERT INTO low_attendance_roster(
+                student_id, attended_classes, total_classes, attendance_percentage, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            roster_rows,
+        )
+    if record_events and events:
+        db.executemany(
+            """
+            INSERT INTO attendance_threshold_events(
+                student_id, event, attendance_percentage, created_at
+            )
+            VALUES (?, ?, ?, ?)
+            """,
+            events,
+        )
+
+
+def rebuild_low_attendance_roster(db):
+    db.execute("DELETE FROM low_attendance_roster")
+    student_ids = [
+        row["student_id"]
+        for row in db.execute("SELECT student_id FROM student_attendance_summary").fetchall()
+    ]
+    for chunk in _chunked(student_ids, 500):
+        _refresh_low_attendance_roster(db, chunk, record_events=False)
+
+
+def verify_attendance_summary(db):
+    return db.execute(
+        """
+        SELECT
+            s.id AS student_id,
+            s.roll_no,
+            COALESCE(sas.total_classes, 0) AS summary_total,
+            COALESCE(sas.attended_classes, 0) AS summary_attended,
+            COALESCE(raw.total_classes, 0) AS actual_total,
+            COALESCE(raw.attended_classes, 0) AS actual_attended
+        FROM students s
+        LEFT JOIN student_attendance_summary sas ON sas.student_id = s.id
+        LEFT JOIN (
+            SELECT student_id, COUNT(*) AS total_classes, SUM(status) AS attended_classes
+            FROM attendance_records
+            GROUP BY student_id
+        ) raw ON raw.student_id = s.id
+        -- A student with no summary row and no records is consistent (0 of 0).
+        WHERE COALESCE(sas.total_classes, 0) <> COALESCE(raw.total_classes, 0)
+           OR COALESCE(sas.attended_classes, 0) <> COALESCE(raw.attended_classes, 0)
+        ORDER BY s.roll_no
+        """
+    ).fetchall()
+
+
+def _attendance_record_student_ids(db, record_ids):
+    student_ids = set()
+    for chunk in _chunked(record_ids, 500):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = db.execute(
+            f"SELECT DISTINCT student_id FROM attendance_records WHERE id IN ({placeholders})",
+            tuple(chunk),
+        ).fetchall()
+        student_ids.update(row["student_id"] for row in rows)
+    return student_ids
+
+
+def _add_attendance_record(db, student_id, attendance_date, subject, status):
+    db.execute(
+        "INSERT INTO attendance_records(student_id, attendance_date, subject, status) VALUES (?, ?, ?, ?)",
+        (student_id, attendance_date, subject, status),
+    )
+    refresh_attendance_summary(db, [student_id])
+
+
+def _update_attendance_statuses(db, updates):
+    student_ids = _attendance_record_student_ids(db, [record_id for _, record_id in updates])
+    db.executemany(
+        "UPDATE attendance_records SET status = ? WHERE id = ?",
+        updates,
+    )
+    refresh_attendance_summary(db, student_ids)
+
+
+def _delete_attendance_record(db, record_id):
+    student_ids = _attendance_record_student_ids(db, [record_id])
+    db.execute("DELETE FROM attendance_records WHERE id = ?", (record_id,))
+    refresh_attendance_summary(db, student_ids)
+
+
+def _create_low_attendance_roster(db):
+    if db.backend == "postgres":
+        db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS low_attendance_roster (
+                student_id BIGINT PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+                attended_classes INTEGER NOT NULL,
+                total_classes INTEGER NOT NULL,
+                attendance_percentage DOUBLE PRECISION NOT NULL,
+                updated_at BIGINT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS attendance_threshold_events (
+                id BIGSERIAL PRIMARY KEY,
+                student_id BIGINT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+                event TEXT NOT NULL,
+                attendance_percentage DOUBLE PRECISION NOT NULL,
+                created_at BIGINT NOT NULL
+            );
+            """
+        )
+    else:
+        db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS low_attendance_roster (
+                student_id INTEGER PRIMARY KEY,
+                attended_classes INTEGER NOT NULL,
+                total_classes INTEGER NOT NULL,
+                attendance_percentage REAL NOT NULL,
+                updated_at INTEGER NOT NULL,
+                FOREIGN KEY(student_id) REFERENCES students(id)
+            );
+
+            CREATE TABLE IF NOT EXISTS attendance_threshold_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                attendance_percentage REAL NOT NULL,
+                created_at INTEGER NOT NULL,
+                FOREIGN KEY(student_id) REFERENCES students(id)
+            );
+            """
+        )
+    db.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_low_attendance_roster_percentage
+        ON low_attendance_roster(attendance_percentage)
+        """
+    )
+    db.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attendance_threshold_events_created
+        ON attendance_threshold_events(created_at)
+        """
+    )
+    rebuild_low_attendance_roster(db)
+
+
+def _create_sync_jobs_table(db):
+    timestamp_type = "BIGINT" if db.backend == "postgres" else "INTEGER"
+    db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS sync_jobs (
+            id TEXT PRIMARY KEY,
+            idempotency_key TEXT UNIQUE,
+            status TEXT NOT NULL,
+            payload TEXT,
+            total_items INTEGER NOT NULL DEFAULT 0,
+            processed_items INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            created_at {timestamp_type} NOT NULL,
+            started_at {timestamp_type},
+            finished_at {timestamp_type}
+        )
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sync_jobs_status_created ON sync_jobs(status, created_at)"
+    )
+
+
+def _add_sync_job_heartbeat(db):
+    if db.backend == "postgres":
+        db.execute("ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS heartbeat_at BIGINT")
+        return
+    columns = {row["name"] for row in db.execute("PRAGMA table_info(sync_jobs)").fetchall()}
+    if "heartbeat_at" not in columns:
+        db.execute("ALTER TABLE sync_jobs ADD COLUMN heartbeat_at INTEGER")
+
+
+def _create_change_log(db):
+    student_columns = ", ".join(CHANGE_FEED_STUDENT_COLUMNS)
+    if db.backend == "postgres":
+        # Rows are paged by (txid, seq) and only once every older transaction has finished,
+        # so a consumer cannot skip a change that commits after a later sequence number.
+        db.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq BIGSERIAL PRIMARY KEY,
+                txid BIGINT NOT NULL DEFAULT txid_current(),
+                entity TEXT NOT NULL,
+                entity_id BIGINT NOT NULL,
+                operation TEXT NOT NULL,
+                changed_at BIGINT NOT NULL DEFAULT EXTRACT(EPOCH FROM now())::BIGINT
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_change_log_cursor ON change_log(txid, seq);
+
+            CREATE OR REPLACE FUNCTION record_change_log() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    INSERT INTO change_log(entity, entity_id, operation) VALUES (TG_ARGV[0], OLD.id, 'delete');
+                    RETURN OLD;
+                END IF;
+                INSERT INTO change_log(entity, entity_id, operation) VALUES (TG_ARGV[0], NEW.id, 'upsert');
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_students_change_log ON students;
+            CREATE TRIGGER trg_students_change_log
+            AFTER INSERT OR DELETE OR UPDATE OF {student_columns} ON students
+            FOR EACH ROW EXECUTE FUNCTION record_change_log('student');
+
+            DROP TRIGGER IF EXISTS trg_attendance_change_log ON attendance_records;
+            CREATE TRIGGER trg_attendance_change_log
+            AFTER INSERT OR UPDATE OR DELETE ON attendance_records
+            FOR EACH ROW EXECUTE FUNCTION record_change_log('attendance');
+            """
+        )
+    else:
+        changed_at = "CAST(strftime('%s', 'now') AS INTEGER)"
+        db.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                txid INTEGER NOT NULL DEFAULT 0,
+                entity TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                operation TEXT NOT NULL,
+                changed_at INTEGER NOT NULL DEFAULT ({changed_at})
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_change_log_cursor ON change_log(txid, seq);
+
+            CREATE TRIGGER IF NOT EXISTS trg_students_change_insert AFTER INSERT ON students
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('student', NEW.id, 'upsert');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_students_change_update
+            AFTER UPDATE OF {student_columns} ON students
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('student', NEW.id, 'upsert');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_students_change_delete AFTER DELETE ON students
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('student', OLD.id, 'delete');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_change_insert AFTER INSERT ON attendance_records
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('attendance', NEW.id, 'upsert');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_change_update AFTER UPDATE ON attendance_records
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('attendance', NEW.id, 'upsert');
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_attendance_change_delete AFTER DELETE ON attendance_records
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('attendance', OLD.id, 'delete');
+            END;
+            """
+        )
+    db.execute(
+        """
+        INSERT INTO change_log(entity, entity_id, operation)
+        SELECT 'student', id, 'upsert' FROM students ORDER BY id
+        """
+    )
+    db.execute(
+        """
+        INSERT INTO change_log(entity, entity_id, operation)
+        SELECT 'attendance', id, 'upsert' FROM attendance_records ORDER BY id
+        """
+    )
+
+
+def _guard_change_log_updates(db):
+    # Upserts that rewrite a row with the values it already has no longer add change_log entries.
+    student_columns = ", ".join(CHANGE_FEED_STUDENT_COLUMNS)
+    if db.backend == "postgres":
+        old_students = ", ".join(f"OLD.{column}" for column in CHANGE_FEED_STUDENT_COLUMNS)
+        new_students = ", ".join(f"NEW.{column}" for column in CHANGE_FEED_STUDENT_COLUMNS)
+        old_attendance = ", ".join(f"OLD.{column}" for column in CHANGE_FEED_ATTENDANCE_COLUMNS)
+        new_attendance = ", ".join(f"NEW.{column}" for column in CHANGE_FEED_ATTENDANCE_COLUMNS)
+        db.executescript(
+            f"""
+            DROP TRIGGER IF EXISTS trg_students_change_log ON students;
+            CREATE TRIGGER trg_students_change_log
+            AFTER INSERT OR DELETE ON students
+            FOR EACH ROW EXECUTE FUNCTION record_change_log('student');
+
+            DROP TRIGGER IF EXISTS trg_students_change_update ON students;
+            CREATE TRIGGER trg_students_change_update
+            AFTER UPDATE OF {student_columns} ON students
+            FOR EACH ROW
+            WHEN (ROW({old_students}) IS DISTINCT FROM ROW({new_students}))
+            EXECUTE FUNCTION record_change_log('student');
+
+            DROP TRIGGER IF EXISTS trg_attendance_change_log ON attendance_records;
+            CREATE TRIGGER trg_attendance_change_log
+            AFTER INSERT OR DELETE ON attendance_records
+            FOR EACH ROW EXECUTE FUNCTION record_change_log('attendance');
+
+            DROP TRIGGER IF EXISTS trg_attendance_change_update ON attendance_records;
+            CREATE TRIGGER trg_attendance_change_update
+            AFTER UPDATE ON attendance_records
+            FOR EACH ROW
+            WHEN (ROW({old_attendance}) IS DISTINCT FROM ROW({new_attendance}))
+            EXECUTE FUNCTION record_change_log('attendance');
+            """
+        )
+    else:
+        students_changed = " OR ".join(
+            f"OLD.{column} IS NOT NEW.{column}" for column in CHANGE_FEED_STUDENT_COLUMNS
+        )
+        attendance_changed = " OR ".join(
+            f"OLD.{column} IS NOT NEW.{column}" for column in CHANGE_FEED_ATTENDANCE_COLUMNS
+        )
+        db.executescript(
+            f"""
+            DROP TRIGGER IF EXISTS trg_students_change_update;
+            CREATE TRIGGER trg_students_change_update
+            AFTER UPDATE OF {student_columns} ON students
+            WHEN {students_changed}
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('student', NEW.id, 'upsert');
+            END;
+
+            DROP TRIGGER IF EXISTS trg_attendance_change_update;
+            CREATE TRIGGER trg_attendance_change_update AFTER UPDATE ON attendance_records
+            WHEN {attendance_changed}
+            BEGIN
+                INSERT INTO change_log(entity, entity_id, operation) VALUES ('attendance', NEW.id, 'upsert');
+            END;
+            """
+        )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_change_log_entity ON change_log(entity, entity_id, txid, seq)"
+    )
+
+
+def _create_import_manifest(db):
+    timestamp_type = "BIGINT" if db.backend == "postgres" else "INTEGER"
+    db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS import_manifest (
+            path TEXT PRIMARY KEY,
+            size {timestamp_type} NOT NULL,
+            mtime_ns {timestamp_type} NOT NULL,
+            content_hash TEXT NOT NULL,
+            imported_at {timestamp_type} NOT NULL
+        )
+        """
     )
     db.execute(
-        "CREATE INDEX IF NOT EXISTS idx_teachers_email ON teachers(email)"
+        """
+        CREATE TABLE IF NOT EXISTS import_manifest_rows (
+            path TEXT NOT NULL,
+            roll_no TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (path, roll_no)
+        )
+        """
     )
 
-    teachers_without_email = db.execute(
-        "SELECT id, username FROM teachers WHERE email IS NULL OR email = ''"
-    ).fetchall()
-    for row in teachers_without_email:
-        generated_email = f"{row['username']}@college.local"
-        db.execute(
-            "UPDATE teachers SET email = ? WHERE id = ?",
-            (generated_email, row["id"]),
-        )
+
+# Ordered and append-only: each step runs once per database and is recorded in schema_version.
+# Versions 4 and 5 were the teacher seeds, which now run on every boot (_apply_boot_checks).
+SCHEMA_MIGRATIONS = [
+    (1, "create base tables", _create_base_tables),
+    (2, "students columns and indexes", _migrate_students_table),
+    (3, "teachers columns and indexes", _migrate_teachers_table),
+    (6, "attendance_records lookup index", _create_attendance_indexes),
+    (7, "student attendance summary", _create_attendance_summary_table),
+    (8, "low attendance roster and threshold events", _create_low_attendance_roster),
+    (9, "sync jobs", _create_sync_jobs_table),
+    (10, "change log", _create_change_log),
+    (11, "import manifest", _create_import_manifest),
+    (12, "sync job heartbeat", _add_sync_job_heartbeat),
+    (13, "change log update guards", _guard_change_log_updates),
+    (14, "student and teacher account defaults", _backfill_account_defaults),
+]
 
 
 def calculate_stats(student_id: int):
     db = get_db()
     totals = db.execute(
         """
-        SELECT
-            COUNT(*) AS total_classes,
-            COALESCE(SUM(status), 0) AS attended_classes
-        FROM attendance_records
+        SELECT total_classes, attended_classes
+        FROM student_attendance_summary
         WHERE student_id = ?
         """,
         (student_id,),
+        prepare=True,
     ).fetchone()
+    if totals is None:
+        totals = db.execute(
+            """
+            SELECT
+                COUNT(*) AS total_classes,
+                COALESCE(SUM(status), 0) AS attended_classes
+            FROM attendance_records
+            WHERE student_id = ?
+            """,
+            (student_id,),
+            prepare=True,
+        ).fetchone()
 
     total = totals["total_classes"]
     attended = totals["attended_classes"]
@@ -768,6 +2529,47 @@ def _build_attendance_class_dates(total_classes: int):
     return dates
 
 
+@lru_cache(maxsize=4096)
+def _synthesized_attendance(attended_classes: int, total_classes: int) -> Tuple[Tuple[str, int], ...]:
+    # Depends only on the counts and the fixed window, so every student with the same
+    # counts shares one result.
+    return tuple(
+        zip(
+            _build_attendance_class_dates(total_classes),
+            _build_spread_statuses(attended_classes, total_classes),
+        )
+    )
+
+
+def replace_synthesized_attendance(db, targets: Dict[int, Tuple[int, int]]) -> int:
+    written = 0
+    for chunk in _chunked(sorted(targets), SQL_MAX_PARAMETERS):
+        db.execute(
+            f"DELETE FROM attendance_records WHERE student_id IN ({', '.join('?' for _ in chunk)})",
+            chunk,
+        )
+        rows = []
+        for student_id in chunk:
+            attended_classes, total_classes = targets[student_id]
+            total_classes = max(0, total_classes)
+            attended_classes = min(max(0, attended_classes), total_classes)
+            rows.extend(
+                (student_id, attendance_date, SYNTHESIZED_ATTENDANCE_SUBJECT, status)
+                for attendance_date, status in _synthesized_attendance(attended_classes, total_classes)
+            )
+        if not rows:
+            continue
+        if db.backend == "postgres":
+            db.copy_rows("COPY attendance_records(student_id, attendance_date, subject, status) FROM STDIN", rows)
+        else:
+            db.executemany(
+                "INSERT INTO attendance_records(student_id, attendance_date, subject, status) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        written += len(rows)
+    return written
+
+
 def _load_attendance_snapshot() -> Dict[str, dict]:
     global _ATTENDANCE_SNAPSHOT_CACHE
     if _ATTENDANCE_SNAPSHOT_CACHE is not None:
@@ -1037,125 +2839,374 @@ def _parse_class_docx(docx_path: str):
     }
 
 
-def import_class_docx_attendance():
-    if Document is None:
+def _timed_parse_class_docx(docx_path: str):
+    started = time.perf_counter()
+    parsed = _parse_class_docx(docx_path)
+    return docx_path, parsed, time.perf_counter() - started
+
+
+def parse_class_docx_files(paths):
+    return _process_map(
+        _timed_parse_class_docx,
+        [path for path in paths if path and os.path.exists(path)],
+        DOCX_PARSE_WORKERS,
+    )
+
+
+def _file_content_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _save_import_manifest(db, path: str, source: dict, rows: Optional[Dict[str, str]] = None):
+    db.execute(
+        """
+        INSERT INTO import_manifest(path, size, mtime_ns, content_hash, imported_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            size = excluded.size,
+            mtime_ns = excluded.mtime_ns,
+            content_hash = excluded.content_hash,
+            imported_at = excluded.imported_at
+        """,
+        (path, source["size"], source["mtime_ns"], source["content_hash"], int(time.time())),
+    )
+    if rows is None:
         return
+    db.execute("DELETE FROM import_manifest_rows WHERE path = ?", (path,))
+    _insert_values_many(
+        db,
+        "INSERT INTO import_manifest_rows(path, roll_no, data) VALUES",
+        [(path, roll_no, data) for roll_no, data in rows.items()],
+    )
 
-    db = get_db()
-    for path in CLASS_DOCX_PATHS:
-        parsed = _parse_class_docx(path)
-        if not parsed or not parsed["rows"]:
+
+def _upsert_import_manifest_rows(db, path: str, rows: Dict[str, str]):
+    _insert_values_many(
+        db,
+        "INSERT INTO import_manifest_rows(path, roll_no, data) VALUES",
+        [(path, roll_no, data) for roll_no, data in rows.items()],
+        "ON CONFLICT(path, roll_no) DO UPDATE SET data = excluded.data",
+    )
+
+
+def _import_manifest_rows(db, path: str) -> Dict[str, str]:
+    return {
+        row["roll_no"]: row["data"]
+        for row in db.execute(
+            "SELECT roll_no, data FROM import_manifest_rows WHERE path = ?",
+            (path,),
+        ).fetchall()
+    }
+
+
+def _check_import_source(db, path: str, force: bool = False):
+    # Returns ("unchanged", None), ("touched", fingerprint) when only the mtime moved,
+    # or ("changed", fingerprint).
+    stat = os.stat(path)
+    entry = db.execute(
+        "SELECT size, mtime_ns, content_hash FROM import_manifest WHERE path = ?",
+        (path,),
+    ).fetchone()
+    if entry and not force and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return "unchanged", None
+
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "content_hash": _file_content_hash(path)}
+    if entry and not force and entry["content_hash"] == source["content_hash"]:
+        return "touched", source
+    return "changed", source
+
+
+def plan_class_docx_import(db, force: bool = False) -> dict:
+    timings = {}
+    started = time.perf_counter()
+    paths = list(dict.fromkeys(path for path in CLASS_DOCX_PATHS if path and os.path.exists(path)))
+    sources = {}
+    touched = {}
+    for path in paths:
+        status, source = _check_import_source(db, path, force)
+        if status == "changed":
+            sources[path] = source
+        elif status == "touched":
+            touched[path] = source
+    timings["check"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parsed_files = parse_class_docx_files(list(sources))
+    parsed_by_path = {path: parsed for path, parsed, _ in parsed_files}
+    timings["parse"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    # A roll_no listed in several files keeps the data of the last one, as if every file
+    # were re-imported in CLASS_DOCX_PATHS order.
+    manifests = {path: _import_manifest_rows(db, path) for path in paths}
+    roll_numbers_by_path = {
+        path: (
+            {row["roll_no"] for row in (parsed_by_path[path] or {}).get("rows", [])}
+            if path in sources
+            else set(manifests[path])
+        )
+        for path in paths
+    }
+    listed_later = {}
+    seen = set()
+    for path in reversed(paths):
+        listed_later[path] = set(seen)
+        seen |= roll_numbers_by_path[path]
+
+    # A student dropped from a changed file falls back to the last other file that lists it,
+    # which is then applied for that student even if it has not changed itself.
+    reapply = {}
+    for path in sources:
+        for roll_no in set(manifests[path]) - roll_numbers_by_path[path] - listed_later[path]:
+            winner = next((other for other in reversed(paths) if roll_no in roll_numbers_by_path[other]), None)
+            if winner is not None:
+                reapply.setdefault(winner, set()).add(roll_no)
+
+    files = [
+        {
+            "path": path,
+            "rows": len(roll_numbers_by_path[path]),
+            "applied": len(reapply.get(path, ())),
+            "skipped": True,
+            "parse_seconds": 0.0,
+        }
+        for path in paths
+        if path not in sources
+    ]
+    changes = []
+    existing = {}
+    for path in paths:
+        if path in sources or path not in reapply:
             continue
+        # Unchanged files are re-applied from their manifest rows, grouped like a parsed file.
+        file_existing = _existing_roll_numbers(db, reapply[path])
+        existing.update(file_existing)
+        groups = {}
+        for roll_no in sorted(reapply[path]):
+            row = json.loads(manifests[path][roll_no])
+            groups.setdefault((row["class_label"], row["semester"]), {})[roll_no] = row
+        for (class_label, semester), rows in groups.items():
+            changes.append(
+                {
+                    "path": path,
+                    "source": None,
+                    "class_label": class_label,
+                    "semester": semester,
+                    "manifest_rows": {roll_no: manifests[path][roll_no] for roll_no in rows},
+                    "creates": {roll_no: row for roll_no, row in rows.items() if roll_no not in file_existing},
+                    "updates": {roll_no: row for roll_no, row in rows.items() if roll_no in file_existing},
+                }
+            )
+
+    for path, parsed, elapsed in parsed_files:
+        rows = parsed["rows"] if parsed else []
+        class_label = parsed["class_label"] if parsed else ""
+        semester = parsed["semester"] if parsed else ""
+        previous = manifests[path]
+        file_existing = _existing_roll_numbers(db, [row["roll_no"] for row in rows])
+        existing.update(file_existing)
+
+        manifest_rows = {}
+        latest = {}
+        for row in rows:
+            data = json.dumps({**row, "class_label": class_label, "semester": semester}, sort_keys=True)
+            manifest_rows[row["roll_no"]] = data
+            if row["roll_no"] in listed_later[path]:
+                continue
+            if (
+                force
+                or row["roll_no"] in reapply.get(path, ())
+                or previous.get(row["roll_no"]) != data
+                or row["roll_no"] not in file_existing
+            ):
+                latest[row["roll_no"]] = row
+
+        files.append(
+            {
+                "path": path,
+                "rows": len(rows),
+                "applied": len(latest),
+                "skipped": False,
+                "parse_seconds": round(elapsed, 3),
+            }
+        )
+        changes.append(
+            {
+                "path": path,
+                "source": sources[path],
+                "class_label": class_label,
+                "semester": semester,
+                "manifest_rows": manifest_rows,
+                "creates": {roll_no: row for roll_no, row in latest.items() if roll_no not in file_existing},
+                "updates": {roll_no: row for roll_no, row in latest.items() if roll_no in file_existing},
+            }
+        )
+    timings["diff"] = time.perf_counter() - started
+    return {"files": files, "touched": touched, "changes": changes, "existing": existing, "timings": timings}
 
-        class_label = parsed["class_label"]
-        semester = parsed["semester"]
 
-        for row in parsed["rows"]:
-            roll_no = row["roll_no"]
-            name = row["name"]
-            parts = [part for part in name.split() if part]
-            first_name = parts[0] if parts else ""
-            last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
+def import_class_docx_attendance(force: bool = False, chunk_size: Optional[int] = None, progress=None):
+    # Commits every chunk_size students; the manifest rows written with each chunk let an
+    # interrupted run resume where it stopped.
+    if Document is None:
+        return []
 
-            student = db.execute(
-                "SELECT id, email FROM students WHERE roll_no = ?",
-                (roll_no,),
-            ).fetchone()
+    started = time.perf_counter()
+    db = get_db()
+    plan = plan_class_docx_import(db, force)
+    for path, source in plan["touched"].items():
+        _save_import_manifest(db, path, source)
+    db.commit()
+    for entry in plan["files"]:
+        if not entry["skipped"]:
+            app.logger.info(
+                "Parsed %s: %d rows in %.2fs, %d changed",
+                entry["path"],
+                entry["rows"],
+                entry["parse_seconds"],
+                entry["applied"],
+            )
 
-            if student:
-                db.execute(
+    existing = dict(plan["existing"])
+    chunk_size = max(1, min(chunk_size or MAINTENANCE_CHUNK_SIZE, SQL_MAX_PARAMETERS - 1))
+    total = sum(len(change["updates"]) + len(change["creates"]) for change in plan["changes"])
+    done = 0
+    written = 0
+    for change in plan["changes"]:
+        class_label = change["class_label"]
+        semester = change["semester"]
+        for chunk in _chunked(list({**change["updates"], **change["creates"]}.items()), chunk_size):
+            new_passwords = hash_default_passwords(roll_no for roll_no, _ in chunk if roll_no in change["creates"])
+
+            updates = []
+            inserts = []
+            for roll_no, row in chunk:
+                name = row["name"]
+                parts = [part for part in name.split() if part]
+                first_name = parts[0] if parts else ""
+                last_name = " ".join(parts[1:]) if len(parts) > 1 else ""
+                if roll_no in change["updates"]:
+                    updates.append((name, first_name, last_name, class_label, semester, roll_no))
+                else:
+                    inserts.append(
+                        (
+                            name,
+                            first_name,
+                            last_name,
+                            roll_no,
+                            f"{roll_no.lower()}@college.local",
+                            new_passwords[roll_no],
+                            class_label,
+                            semester,
+                        )
+                    )
+            if updates:
+                db.executemany(
                     """
                     UPDATE students
                     SET name = ?, first_name = ?, last_name = ?, department = ?, semester = ?
                     WHERE roll_no = ?
                     """,
-                    (name, first_name, last_name, class_label, semester, roll_no),
+                    updates,
                 )
-                student_id = student["id"]
-            else:
-                email = f"{roll_no.lower()}@college.local"
-                db.execute(
-                    """
-                    INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        name,
-                        first_name,
-                        last_name,
-                        roll_no,
-                        email,
-                        generate_password_hash(roll_no),
-                        class_label,
-                        semester,
-                    ),
+            if inserts:
+                _insert_values_many(
+                    db,
+                    "INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester) VALUES",
+                    inserts,
                 )
-                student_id = db.execute(
-                    "SELECT id FROM students WHERE roll_no = ?",
-                    (roll_no,),
-                ).fetchone()["id"]
-
-            total_classes = max(0, row["total"])
-            attended_classes = min(max(0, row["attended"]), total_classes)
-
-            db.execute("DELETE FROM attendance_records WHERE student_id = ?", (student_id,))
-            if total_classes:
-                statuses = _build_spread_statuses(attended_classes, total_classes)
-                attendance_dates = _build_attendance_class_dates(total_classes)
-                for attendance_date, status in zip(attendance_dates, statuses):
-                    db.execute(
-                        """
-                        INSERT INTO attendance_records(student_id, attendance_date, subject, status)
-                        VALUES (?, ?, ?, ?)
-                        """,
-                        (student_id, attendance_date, "Overall", status),
-                    )
-
-    db.commit()
-
-
-def _read_students_from_xlsx(xlsx_path: str):
-    ns = {
-        "m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
-        "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-    }
-
-    with zipfile.ZipFile(xlsx_path) as zf:
-        shared_strings = []
-        if "xl/sharedStrings.xml" in zf.namelist():
-            shared_root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
-            for item in shared_root.findall("m:si", ns):
-                texts = [node.text or "" for node in item.findall(".//m:t", ns)]
-                shared_strings.append("".join(texts))
-
-        workbook = ET.fromstring(zf.read("xl/workbook.xml"))
-        rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
-        rel_id_to_target = {
-            rel.attrib["Id"]: rel.attrib["Target"]
-            for rel in rels.findall(
-                "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+                existing.update(_existing_roll_numbers(db, [insert[3] for insert in inserts]))
+
+            synthesized = {existing[roll_no]: (row["attended"], row["total"]) for roll_no, row in chunk}
+            written += replace_synthesized_attendance(db, synthesized)
+            refresh_attendance_summary(db, synthesized)
+            _upsert_import_manifest_rows(
+                db,
+                change["path"],
+                {roll_no: change["manifest_rows"][roll_no] for roll_no, _ in chunk},
             )
-        }
-        first_sheet = workbook.find("m:sheets/m:sheet", ns)
-        if first_sheet is None:
-            return []
+            db.commit()
+            done += len(chunk)
+            if progress:
+                progress(done, total, written)
 
-        rel_id = first_sheet.attrib.get(
-            "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
-        )
-        target = rel_id_to_target.get(rel_id, "")
+        if change["source"] is not None:
+            _save_import_manifest(db, change["path"], change["source"], change["manifest_rows"])
+            db.commit()
+
+    app.logger.info(
+        "Imported %d class files (%d unchanged): parsing took %.2fs, %.2fs in total",
+        len(plan["files"]),
+        sum(1 for entry in plan["files"] if entry["skipped"]),
+        plan["timings"]["parse"],
+        time.perf_counter() - started,
+    )
+    return plan["files"]
+
+
+def _xlsx_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    shared_strings = []
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return shared_strings
+    with zf.open("xl/sharedStrings.xml") as source:
+        for _, elem in ET.iterparse(source):
+            if elem.tag == f"{XLSX_MAIN_NS}si":
+                shared_strings.append("".join(node.text or "" for node in elem.iter(f"{XLSX_MAIN_NS}t")))
+                elem.clear()
+    return shared_strings
+
+
+def _xlsx_sheet_targets(zf: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    rel_id_to_target = {rel.attrib["Id"]: rel.attrib["Target"] for rel in rels.findall(XLSX_PACKAGE_REL)}
+    targets = []
+    for sheet in workbook.findall(f"{XLSX_MAIN_NS}sheets/{XLSX_MAIN_NS}sheet"):
+        target = rel_id_to_target.get(sheet.attrib.get(XLSX_REL_ID), "").lstrip("/")
         if not target:
-            return []
+            continue
         if not target.startswith("xl/"):
             target = f"xl/{target}"
+        targets.append((sheet.attrib.get("name", ""), target))
+    return targets
+
+
+def _xlsx_column_index(cell_ref: str) -> Optional[int]:
+    column = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        column = column * 26 + ord(char.upper()) - ord("A") + 1
+    return column - 1 if column else None
+
+
+def _iter_xlsx_rows(zf: zipfile.ZipFile, target: str, shared_strings: List[str]):
+    sheet_data = None
+    with zf.open(target) as source:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{XLSX_MAIN_NS}sheetData":
+                    sheet_data = elem
+                continue
+            if elem.tag != f"{XLSX_MAIN_NS}row":
+                continue
 
-        sheet_root = ET.fromstring(zf.read(target))
-        rows = []
-        for row in sheet_root.findall("m:sheetData/m:row", ns):
             values = []
-            for cell in row.findall("m:c", ns):
+            for cell in elem.findall(f"{XLSX_MAIN_NS}c"):
+                # Empty cells are usually omitted, so place each value by its reference.
+                column = _xlsx_column_index(cell.attrib.get("r", ""))
+                if column is not None and column > len(values):
+                    values.extend([""] * (column - len(values)))
+
                 cell_type = cell.attrib.get("t")
-                value_node = cell.find("m:v", ns)
+                if cell_type == "inlineStr":
+                    values.append("".join(node.text or "" for node in cell.iter(f"{XLSX_MAIN_NS}t")))
+                    continue
+                value_node = cell.find(f"{XLSX_MAIN_NS}v")
                 if value_node is None:
                     values.append("")
                     continue
@@ -1165,77 +3216,210 @@ def _read_students_from_xlsx(xlsx_path: str):
                     values.append(shared_strings[int(raw_value)])
                 else:
                     values.append(raw_value)
-            rows.append(values)
+            yield values
 
-    if not rows:
-        return []
-
-    students = []
-    for row in rows[1:]:
-        if len(row) < 5:
-            continue
-        roll_no = row[0].strip()
-        first_name = row[1].strip()
-        last_name = row[2].strip()
-        email = row[3].strip().lower()
-        department = row[4].strip()
-        if not roll_no or not email:
-            continue
-        full_name = " ".join(part for part in [first_name, last_name] if part).strip()
-        students.append(
-            {
-                "roll_no": roll_no,
-                "first_name": first_name,
-                "last_name": last_name,
-                "name": full_name or roll_no,
-                "email": email,
-                "department": department,
-            }
-        )
+            # Drop parsed rows so memory stays flat however long the sheet is.
+            elem.clear()
+            if sheet_data is not None:
+                sheet_data.clear()
 
-    return sorted(students, key=lambda row: row["roll_no"])
 
+def _iter_students_from_xlsx(xlsx_path: str, sheets: Optional[List[str]] = None):
+    sheets = STUDENT_DATA_SHEETS if sheets is None else sheets
+    with zipfile.ZipFile(xlsx_path) as zf:
+        shared_strings = _xlsx_shared_strings(zf)
+        targets = _xlsx_sheet_targets(zf)
+        if not sheets:
+            targets = targets[:1]
+        elif "*" not in sheets:
+            targets = [(name, target) for name, target in targets if name in sheets]
+
+        for _, target in targets:
+            rows = _iter_xlsx_rows(zf, target, shared_strings)
+            next(rows, None)
+            for row in rows:
+                if len(row) < 5:
+                    continue
+                roll_no = row[0].strip()
+                first_name = row[1].strip()
+                last_name = row[2].strip()
+                email = row[3].strip().lower()
+                department = row[4].strip()
+                if not roll_no or not email:
+                    continue
+                full_name = " ".join(part for part in [first_name, last_name] if part).strip()
+                yield {
+                    "roll_no": roll_no,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "name": full_name or roll_no,
+                    "email": email,
+                    "department": department,
+                }
 
-def import_students_data():
-    xlsx_path = next(
-        (path for path in STUDENT_DATA_PATHS if path and os.path.exists(path)),
-        "",
-    )
-    if not xlsx_path:
-        return
 
-    db = get_db()
-    students = _read_students_from_xlsx(xlsx_path)
+def _diff_students_chunk(db, xlsx_path: str, students, force: bool) -> dict:
+    # Later rows for the same roll_no win; one multi-row upsert cannot touch a row twice.
+    latest = {}
+    for student in students:
+        latest[student["roll_no"]] = student
+
+    roll_numbers = list(latest)
+    placeholders = ", ".join("?" for _ in roll_numbers)
+    previous = {
+        row["roll_no"]: row["data"]
+        for row in db.execute(
+            f"SELECT roll_no, data FROM import_manifest_rows WHERE path = ? AND roll_no IN ({placeholders})",
+            (xlsx_path, *roll_numbers),
+        ).fetchall()
+    }
     existing_passwords = {
         row["roll_no"]: row["password_hash"]
-        for row in db.execute("SELECT roll_no, password_hash FROM students").fetchall()
+        for row in db.execute(
+            f"SELECT roll_no, password_hash FROM students WHERE roll_no IN ({placeholders})",
+            roll_numbers,
+        ).fetchall()
     }
-    for student in students:
-        password_hash = existing_passwords.get(student["roll_no"]) or generate_password_hash(
-            student["roll_no"]
-        )
-        db.execute(
-            """
-            INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(roll_no) DO UPDATE SET
-                name = excluded.name,
-                first_name = excluded.first_name,
-                last_name = excluded.last_name,
-                email = excluded.email,
-                department = excluded.department
-            """,
+
+    manifest_rows = {roll_no: json.dumps(student, sort_keys=True) for roll_no, student in latest.items()}
+    changed_students = [
+        student
+        for roll_no, student in latest.items()
+        if force or previous.get(roll_no) != manifest_rows[roll_no] or roll_no not in existing_passwords
+    ]
+    return {
+        "roll_numbers": roll_numbers,
+        "previous": previous,
+        "existing_passwords": existing_passwords,
+        "manifest_rows": manifest_rows,
+        "changed": changed_students,
+    }
+
+
+def _import_students_chunk(db, xlsx_path: str, students, force: bool):
+    diff = _diff_students_chunk(db, xlsx_path, students, force)
+    previous = diff["previous"]
+    existing_passwords = diff["existing_passwords"]
+    manifest_rows = diff["manifest_rows"]
+    changed_students = diff["changed"]
+    new_passwords = hash_default_passwords(
+        student["roll_no"] for student in changed_students if not existing_passwords.get(student["roll_no"])
+    )
+    _insert_values_many(
+        db,
+        "INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester) VALUES",
+        [
             (
                 student["name"],
                 student["first_name"],
                 student["last_name"],
                 student["roll_no"],
                 student["email"],
-                password_hash,
+                existing_passwords.get(student["roll_no"]) or new_passwords[student["roll_no"]],
                 student["department"] or "N/A",
                 "2",
-            ),
-        )
+            )
+            for student in changed_students
+        ],
+        """
+        ON CONFLICT(roll_no) DO UPDATE SET
+            name = excluded.name,
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            email = excluded.email,
+            department = excluded.department
+        """,
+    )
+    _upsert_import_manifest_rows(
+        db,
+        xlsx_path,
+        {roll_no: data for roll_no, data in manifest_rows.items() if previous.get(roll_no) != data},
+    )
+    return diff["roll_numbers"], len(changed_students)
+
+
+def _student_data_path() -> str:
+    return next(
+        (path for path in STUDENT_DATA_PATHS if path and os.path.exists(path)),
+        "",
+    )
+
+
+def _stale_manifest_roll_numbers(db, path: str, seen) -> set:
+    return {
+        row["roll_no"]
+        for row in db.execute(
+            "SELECT roll_no FROM import_manifest_rows WHERE path = ?",
+            (path,),
+        ).fetchall()
+    } - seen
+
+
+def plan_students_import(db, force: bool = False, sheets: Optional[List[str]] = None) -> dict:
+    xlsx_path = _student_data_path()
+    plan = {"path": xlsx_path, "skipped": True, "rows": 0, "create": 0, "update": 0, "departments": {}, "timings": {}}
+    if not xlsx_path:
+        return plan
+
+    started = time.perf_counter()
+    status, _ = _check_import_source(db, xlsx_path, force)
+    plan["timings"]["check"] = time.perf_counter() - started
+    if status != "changed":
+        return plan
+
+    started = time.perf_counter()
+    plan["skipped"] = False
+    seen = set()
+    chunk_size = max(1, min(STUDENT_IMPORT_CHUNK_SIZE, SQL_MAX_PARAMETERS - 1))
+    for chunk in _chunked(_iter_students_from_xlsx(xlsx_path, sheets), chunk_size):
+        diff = _diff_students_chunk(db, xlsx_path, chunk, force)
+        plan["rows"] += len(chunk)
+        seen.update(diff["roll_numbers"])
+        for student in diff["changed"]:
+            action = "update" if student["roll_no"] in diff["existing_passwords"] else "create"
+            plan[action] += 1
+            counts = plan["departments"].setdefault(student["department"] or "N/A", {"create": 0, "update": 0})
+            counts[action] += 1
+    plan["stale_manifest_rows"] = len(_stale_manifest_roll_numbers(db, xlsx_path, seen))
+    plan["timings"]["read_and_diff"] = time.perf_counter() - started
+    return plan
+
+
+def import_students_data(
+    force: bool = False,
+    sheets: Optional[List[str]] = None,
+    chunk_size: Optional[int] = None,
+    progress=None,
+):
+    xlsx_path = _student_data_path()
+    if not xlsx_path:
+        return
+
+    db = get_db()
+    status, source = _check_import_source(db, xlsx_path, force)
+    if status == "touched":
+        _save_import_manifest(db, xlsx_path, source)
+    if status == "changed":
+        seen = set()
+        done = 0
+        written = 0
+        chunk_size = max(1, min(chunk_size or STUDENT_IMPORT_CHUNK_SIZE, SQL_MAX_PARAMETERS - 1))
+        for chunk in _chunked(_iter_students_from_xlsx(xlsx_path, sheets), chunk_size):
+            roll_numbers, changed = _import_students_chunk(db, xlsx_path, chunk, force)
+            seen.update(roll_numbers)
+            db.commit()
+            done += len(chunk)
+            written += changed
+            if progress:
+                progress(done, None, written)
+
+        stale = _stale_manifest_roll_numbers(db, xlsx_path, seen)
+        for chunk in _chunked(sorted(stale), SQL_MAX_PARAMETERS - 1):
+            db.execute(
+                f"DELETE FROM import_manifest_rows WHERE path = ? AND roll_no IN ({', '.join('?' for _ in chunk)})",
+                (xlsx_path, *chunk),
+            )
+        _save_import_manifest(db, xlsx_path, source)
 
     db.execute(
         """
@@ -1245,137 +3429,181 @@ def import_students_data():
         )
         """
     )
+    for table in ("student_attendance_summary", "low_attendance_roster", "attendance_threshold_events"):
+        db.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE student_id IN (
+                SELECT id FROM students WHERE roll_no = 'CSE001'
+            )
+            """
+        )
     db.execute("DELETE FROM students WHERE roll_no = 'CSE001'")
     db.commit()
 
 
-def seed_civil_attendance_data():
+def seed_civil_attendance_data(chunk_size: Optional[int] = None, progress=None, force: bool = False) -> int:
+    # Seeded students are recorded in import_manifest_rows, so a re-run (or a resumed one)
+    # only rewrites students whose built-in values changed or whose rows were never committed.
     db = get_db()
-    for roll_no, attended_classes, total_classes in sorted(
-        CIVIL_ATTENDANCE_DATA, key=lambda row: row[0]
-    ):
-        student = db.execute(
-            "SELECT id FROM students WHERE roll_no = ?",
-            (roll_no,),
-        ).fetchone()
-        if not student:
-            db.execute(
-                """
-                INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    roll_no,
-                    "",
-                    "",
-                    roll_no,
-                    f"{roll_no.lower()}@mictech.edu.in",
-                    generate_password_hash(roll_no),
-                    "CIVIL",
-                    "2",
-                ),
-            )
-            student = db.execute(
-                "SELECT id FROM students WHERE roll_no = ?",
-                (roll_no,),
-            ).fetchone()
-        student_id = student["id"]
-
-        db.execute("DELETE FROM attendance_records WHERE student_id = ?", (student_id,))
-        total_classes = max(0, total_classes)
-        attended_classes = min(max(0, attended_classes), total_classes)
-        statuses = _build_spread_statuses(attended_classes, total_classes)
-        attendance_dates = _build_attendance_class_dates(total_classes)
-        for attendance_date, status in zip(attendance_dates, statuses):
-            db.execute(
-                """
-                INSERT INTO attendance_records(student_id, attendance_date, subject, status)
-                VALUES (?, ?, ?, ?)
-                """,
-                (student_id, attendance_date, "Overall", status),
+    seeded = {} if force else _import_manifest_rows(db, CIVIL_SEED_MANIFEST_PATH)
+    existing = _existing_roll_numbers(db, [row[0] for row in CIVIL_ATTENDANCE_DATA])
+    values = {
+        roll_no: json.dumps([attended_classes, total_classes])
+        for roll_no, attended_classes, total_classes in CIVIL_ATTENDANCE_DATA
+    }
+    pending = {
+        roll_no: data
+        for roll_no, data in sorted(values.items())
+        if roll_no not in existing or seeded.get(roll_no) != data
+    }
+    if not pending:
+        db.rollback()
+        return 0
+
+    new_roll_numbers = sorted(set(pending) - set(existing))
+    new_passwords = hash_default_passwords(new_roll_numbers)
+    _insert_values_many(
+        db,
+        "INSERT INTO students(name, first_name, last_name, roll_no, email, password_hash, department, semester) VALUES",
+        [
+            (
+                roll_no,
+                "",
+                "",
+                roll_no,
+                f"{roll_no.lower()}@mictech.edu.in",
+                new_passwords[roll_no],
+                "CIVIL",
+                "2",
             )
-
+            for roll_no in new_roll_numbers
+        ],
+    )
+    existing.update(_existing_roll_numbers(db, new_roll_numbers))
     db.commit()
 
+    roll_numbers = {existing[roll_no]: roll_no for roll_no in pending}
+    synthesized = {existing[roll_no]: tuple(json.loads(data)) for roll_no, data in pending.items()}
+    _replace_synthesized_in_chunks(
+        db,
+        synthesized,
+        chunk_size,
+        progress,
+        lambda db, chunk: _upsert_import_manifest_rows(
+            db,
+            CIVIL_SEED_MANIFEST_PATH,
+            {roll_numbers[student_id]: pending[roll_numbers[student_id]] for student_id in chunk},
+        ),
+    )
+    return len(pending)
 
-def normalize_attendance_window_if_needed():
-    snapshot = _load_attendance_snapshot()
 
-    db = get_db()
+def plan_attendance_normalization(db) -> Dict[int, dict]:
+    snapshot = _load_attendance_snapshot()
     start_date = ATTENDANCE_WINDOW_START.isoformat()
     end_date = ATTENDANCE_WINDOW_END.isoformat()
+    holidays = sorted(holiday.isoformat() for holiday in ATTENDANCE_HOLIDAYS)
+    holiday_hit = "0"
+    if holidays:
+        holiday_hit = f"CASE WHEN a.attendance_date IN ({', '.join('?' for _ in holidays)}) THEN 1 ELSE 0 END"
 
-    students = db.execute(
-        "SELECT id, roll_no FROM students ORDER BY id"
+    current_rows = db.execute(
+        f"""
+        SELECT
+            s.id,
+            s.roll_no,
+            s.department,
+            COUNT(a.id) AS total_classes,
+            COALESCE(SUM(a.status), 0) AS attended_classes,
+            MIN(a.attendance_date) AS min_date,
+            MAX(a.attendance_date) AS max_date,
+            COALESCE(SUM({holiday_hit}), 0) AS holiday_rows
+        FROM students s
+        LEFT JOIN attendance_records a ON a.student_id = s.id
+        GROUP BY s.id, s.roll_no, s.department
+        ORDER BY s.id
+        """,
+        tuple(holidays),
     ).fetchall()
-    for student in students:
-        student_id = student["id"]
-        roll_no = (student["roll_no"] or "").strip()
-        current = db.execute(
-            """
-            SELECT
-                COUNT(*) AS total_classes,
-                COALESCE(SUM(status), 0) AS attended_classes,
-                MIN(attendance_date) AS min_date,
-                MAX(attendance_date) AS max_date
-            FROM attendance_records
-            WHERE student_id = ?
-            """,
-            (student_id,),
-        ).fetchone()
+
+    plan = {}
+    for current in current_rows:
+        roll_no = (current["roll_no"] or "").strip()
+        total_classes = int(current["total_classes"])
+        attended_classes = int(current["attended_classes"])
         if roll_no in snapshot:
             row = snapshot[roll_no]
             target_total = max(0, int(row.get("total", ATTENDANCE_TOTAL_CLASSES)))
             target_attended = min(max(0, int(row.get("attended", 0))), target_total)
         else:
-            target_total = max(0, int(current["total_classes"]))
-            target_attended = min(max(0, int(current["attended_classes"])), target_total)
-
-        holiday_rows = 0
-        for holiday in ATTENDANCE_HOLIDAYS:
-            holiday_rows += db.execute(
-                """
-                SELECT COUNT(*) AS c
-                FROM attendance_records
-                WHERE student_id = ? AND attendance_date = ?
-                """,
-                (student_id, holiday.isoformat()),
-            ).fetchone()["c"]
+            target_total = max(0, total_classes)
+            target_attended = min(max(0, attended_classes), target_total)
 
+        if total_classes == 0 and target_total == 0:
+            continue
         needs_fix = (
-            int(current["total_classes"]) != target_total
-            or int(current["attended_classes"]) != target_attended
-            or current["min_date"] is None
-            or current["max_date"] is None
+            total_classes != target_total
+            or attended_classes != target_attended
             or current["min_date"] < start_date
             or current["max_date"] > end_date
-            or holiday_rows > 0
+            or int(current["holiday_rows"]) > 0
         )
-        if not needs_fix:
-            continue
+        if needs_fix:
+            plan[current["id"]] = {
+                "roll_no": roll_no,
+                "department": current["department"] or "N/A",
+                "current_total": total_classes,
+                "target_total": target_total,
+                "target_attended": target_attended,
+            }
+    return plan
+
+
+def _replace_synthesized_in_chunks(
+    db,
+    targets: Dict[int, Tuple[int, int]],
+    chunk_size: Optional[int],
+    progress,
+    before_commit=None,
+):
+    done = 0
+    written = 0
+    for chunk in _chunked(list(targets), max(1, chunk_size or MAINTENANCE_CHUNK_SIZE)):
+        chunk_targets = {student_id: targets[student_id] for student_id in chunk}
+        written += replace_synthesized_attendance(db, chunk_targets)
+        refresh_attendance_summary(db, chunk_targets)
+        if before_commit:
+            before_commit(db, chunk)
+        db.commit()
+        done += len(chunk)
+        if progress:
+            progress(done, len(targets), written)
+    return written
 
-        db.execute("DELETE FROM attendance_records WHERE student_id = ?", (student_id,))
-        if target_total == 0:
-            continue
-        statuses = _build_spread_statuses(target_attended, target_total)
-        attendance_dates = _build_attendance_class_dates(target_total)
-        db.executemany(
-            """
-            INSERT INTO attendance_records(student_id, attendance_date, subject, status)
-            VALUES (?, ?, ?, ?)
-            """,
-            [
-                (student_id, attendance_date, "Overall", status)
-                for attendance_date, status in zip(attendance_dates, statuses)
-            ],
-        )
 
-    db.commit()
+def normalize_attendance_window_if_needed(chunk_size: Optional[int] = None, progress=None) -> int:
+    # Each chunk is committed on its own; a re-run only plans the students still out of window.
+    db = get_db()
+    targets = {
+        student_id: (entry["target_attended"], entry["target_total"])
+        for student_id, entry in plan_attendance_normalization(db).items()
+    }
+    if not targets:
+        db.rollback()
+        return 0
+    _replace_synthesized_in_chunks(db, targets, chunk_size, progress)
+    return len(targets)
 
 
 def run_startup_maintenance():
+    # Normalisation can rewrite every student's records, so it runs from the CLI
+    # (`flask --app app attendance normalize`) rather than in each web worker.
     if AUTO_NORMALIZE_ATTENDANCE_ON_STARTUP:
-        normalize_attendance_window_if_needed()
+        app.logger.warning(
+            "AUTO_NORMALIZE_ATTENDANCE_ON_STARTUP is ignored; run `flask --app app attendance normalize` instead."
+        )
+    recover_sync_jobs()
 
 
 def send_otp_email(to_email: str, otp: str):
@@ -1433,15 +3661,14 @@ def login():
             student = db.execute(
                 "SELECT * FROM students WHERE roll_no = ?",
                 (username,),
+                prepare=True,
             ).fetchone()
 
             if not student:
                 flash("Student not found. Ask faculty to add your profile.", "error")
                 return render_template("login.html", selected_login_type=login_type)
 
-            password_hash = student["password_hash"]
-            is_valid = bool(password_hash) and check_password_hash(password_hash, password)
-            if not is_valid:
+            if not check_student_password(student, password):
                 flash("Invalid credentials.", "error")
                 return render_template("login.html", selected_login_type=login_type)
 
@@ -1496,11 +3723,12 @@ def forgot_password():
 
         otp = f"{secrets.randbelow(1000000):06d}"
         expires_at = int(time.time()) + OTP_EXPIRY_SECONDS
-        db.execute(
-            "UPDATE students SET reset_otp = ?, reset_otp_expires = ? WHERE id = ?",
-            (otp, expires_at, student["id"]),
+        run_write_transaction(
+            lambda db: db.execute(
+                "UPDATE students SET reset_otp = ?, reset_otp_expires = ? WHERE id = ?",
+                (otp, expires_at, student["id"]),
+            )
         )
-        db.commit()
 
         try:
             send_otp_email(email, otp)
@@ -1537,11 +3765,12 @@ def teacher_forgot_password():
 
         otp = f"{secrets.randbelow(1000000):06d}"
         expires_at = int(time.time()) + OTP_EXPIRY_SECONDS
-        db.execute(
-            "UPDATE teachers SET reset_otp = ?, reset_otp_expires = ? WHERE id = ?",
-            (otp, expires_at, teacher["id"]),
+        run_write_transaction(
+            lambda db: db.execute(
+                "UPDATE teachers SET reset_otp = ?, reset_otp_expires = ? WHERE id = ?",
+                (otp, expires_at, teacher["id"]),
+            )
         )
-        db.commit()
 
         try:
             send_otp_email(email, otp)
@@ -1593,15 +3822,17 @@ def verify_otp():
             flash("Invalid or expired OTP.", "error")
             return render_template("verify_otp.html")
 
-        db.execute(
-            """
-            UPDATE students
-            SET password_hash = ?, reset_otp = NULL, reset_otp_expires = NULL
-            WHERE id = ?
-            """,
-            (generate_password_hash(new_password), student_id),
+        password_hash = generate_password_hash(new_password)
+        run_write_transaction(
+            lambda db: db.execute(
+                """
+                UPDATE students
+                SET password_hash = ?, reset_otp = NULL, reset_otp_expires = NULL
+                WHERE id = ?
+                """,
+                (password_hash, student_id),
+            )
         )
-        db.commit()
         session.pop("password_reset_student_id", None)
         flash("Password reset successful. Please login.", "success")
         return redirect(url_for("login"))
@@ -1644,15 +3875,17 @@ def teacher_verify_otp():
             flash("Invalid or expired OTP.", "error")
             return render_template("teacher_verify_otp.html")
 
-        db.execute(
-            """
-            UPDATE teachers
-            SET password_hash = ?, reset_otp = NULL, reset_otp_expires = NULL
-            WHERE id = ?
-            """,
-            (generate_password_hash(new_password), teacher_id),
+        password_hash = generate_password_hash(new_password)
+        run_write_transaction(
+            lambda db: db.execute(
+                """
+                UPDATE teachers
+                SET password_hash = ?, reset_otp = NULL, reset_otp_expires = NULL
+                WHERE id = ?
+                """,
+                (password_hash, teacher_id),
+            )
         )
-        db.commit()
         session.pop("password_reset_teacher_id", None)
         flash("Faculty password reset successful. Please login.", "success")
         return redirect(url_for("login"))
@@ -1680,18 +3913,20 @@ def change_password():
 
         db = get_db()
         student = db.execute(
-            "SELECT id, password_hash FROM students WHERE id = ?",
+            "SELECT id, roll_no, password_hash FROM students WHERE id = ?",
             (student_id,),
         ).fetchone()
-        if not student or not check_password_hash(student["password_hash"], current_password):
+        if not student or not check_student_password(student, current_password):
             flash("Current password is incorrect.", "error")
             return render_template("change_password.html")
 
-        db.execute(
-            "UPDATE students SET password_hash = ? WHERE id = ?",
-            (generate_password_hash(new_password), student_id),
+        password_hash = generate_password_hash(new_password)
+        run_write_transaction(
+            lambda db: db.execute(
+                "UPDATE students SET password_hash = ? WHERE id = ?",
+                (password_hash, student_id),
+            )
         )
-        db.commit()
         flash("Password updated successfully.", "success")
         return redirect(url_for("dashboard"))
 
@@ -1741,15 +3976,16 @@ def teacher_change_credentials():
             next_password_hash = generate_password_hash(new_password)
 
         try:
-            db.execute(
-                """
-                UPDATE teachers
-                SET username = ?, email = ?, password_hash = ?
-                WHERE id = ?
-                """,
-                (new_username, new_email, next_password_hash, teacher_id),
+            run_write_transaction(
+                lambda db: db.execute(
+                    """
+                    UPDATE teachers
+                    SET username = ?, email = ?, password_hash = ?
+                    WHERE id = ?
+                    """,
+                    (new_username, new_email, next_password_hash, teacher_id),
+                )
             )
-            db.commit()
         except Exception as exc:
             if not is_integrity_error(exc):
                 raise
@@ -1779,7 +4015,9 @@ def dashboard():
         return redirect(url_for("login"))
 
     db = get_db()
-    student = db.execute("SELECT * FROM students WHERE id = ?", (student_id,)).fetchone()
+    student = db.execute(
+        "SELECT * FROM students WHERE id = ?", (student_id,), prepare=True
+    ).fetchone()
     stats = calculate_stats(student_id)
     timetable = _get_student_timetable(student["department"])
 
@@ -1796,6 +4034,7 @@ def dashboard():
         LIMIT 12
         """,
         (student_id,),
+        prepare=True,
     ).fetchall()
 
     return render_template(
@@ -1830,7 +4069,7 @@ def admin():
 
     db = get_db()
     current_teacher = get_logged_in_teacher(db)
-    can_manage_teachers = is_admin_teacher(db)
+    can_manage_teachers = is_admin_teacher(db, current_teacher)
     attendance_roll_no = request.args.get("attendance_roll_no", "").strip()
     attendance_student = None
     attendance_records = []
@@ -1849,16 +4088,20 @@ def admin():
             attendance_date = request.form.get("attendance_date", "").strip() or date.today().isoformat()
 
             student = db.execute(
-                "SELECT id FROM students WHERE roll_no = ?", (roll_no,)
+                "SELECT id FROM students WHERE roll_no = ?", (roll_no,), prepare=True
             ).fetchone()
             if not student or not subject:
                 flash("Valid roll number and subject are required.", "error")
             else:
-                db.execute(
-                    "INSERT INTO attendance_records(student_id, attendance_date, subject, status) VALUES (?, ?, ?, ?)",
-                    (student["id"], attendance_date, subject, 1 if status == "1" else 0),
+                run_write_transaction(
+                    lambda db: _add_attendance_record(
+                        db,
+                        student["id"],
+                        attendance_date,
+                        subject,
+                        1 if status == "1" else 0,
+                    )
                 )
-                db.commit()
                 flash("Attendance record added.", "success")
                 redirect_roll_no = roll_no
 
@@ -1875,15 +4118,17 @@ def admin():
             if not name or not username or not email or not password:
                 flash("Name, username, email, and password are required.", "error")
             else:
+                password_hash = generate_password_hash(password)
                 try:
-                    db.execute(
-                        """
-                        INSERT INTO teachers(name, username, email, password_hash)
-                        VALUES (?, ?, ?, ?)
-                        """,
-                        (name, username, email, generate_password_hash(password)),
+                    run_write_transaction(
+                        lambda db: db.execute(
+                            """
+                            INSERT INTO teachers(name, username, email, password_hash)
+                            VALUES (?, ?, ?, ?)
+                            """,
+                            (name, username, email, password_hash),
+                        )
                     )
-                    db.commit()
                     flash("Faculty added.", "success")
                 except Exception as exc:
                     if not is_integrity_error(exc):
@@ -1903,11 +4148,12 @@ def admin():
             elif username == ADMIN_TEACHER_USERNAME:
                 flash("You cannot remove the admin faculty.", "error")
             else:
-                deleted = db.execute(
-                    "DELETE FROM teachers WHERE username = ?",
-                    (username,),
-                ).rowcount
-                db.commit()
+                deleted = run_write_transaction(
+                    lambda db: db.execute(
+                        "DELETE FROM teachers WHERE username = ?",
+                        (username,),
+                    ).rowcount
+                )
                 if deleted:
                     flash("Faculty removed.", "success")
                 else:
@@ -1928,16 +4174,17 @@ def admin():
 
             if action == "update_attendance":
                 status = request.form.get("status", "0").strip()
-                db.execute(
-                    "UPDATE attendance_records SET status = ? WHERE id = ?",
-                    (1 if status == "1" else 0, int(record_id)),
+                run_write_transaction(
+                    lambda db: _update_attendance_statuses(
+                        db, [(1 if status == "1" else 0, int(record_id))]
+                    )
                 )
-                db.commit()
                 flash("Attendance updated.", "success")
 
             if action == "delete_attendance":
-                db.execute("DELETE FROM attendance_records WHERE id = ?", (int(record_id),))
-                db.commit()
+                run_write_transaction(
+                    lambda db: _delete_attendance_record(db, int(record_id))
+                )
                 flash("Attendance deleted.", "success")
 
             if action == "update_attendance_bulk":
@@ -1955,11 +4202,9 @@ def admin():
                     for rec_id in record_ids:
                         status = request.form.get(f"status_{rec_id}", "0").strip()
                         updates.append((1 if status == "1" else 0, rec_id))
-                    db.executemany(
-                        "UPDATE attendance_records SET status = ? WHERE id = ?",
-                        updates,
+                    run_write_transaction(
+                        lambda db: _update_attendance_statuses(db, updates)
                     )
-                    db.commit()
                     flash(f"Saved {len(updates)} attendance updates.", "success")
 
         return redirect(
@@ -1972,6 +4217,7 @@ def admin():
         attendance_student = db.execute(
             "SELECT id, name, roll_no FROM students WHERE roll_no = ?",
             (attendance_roll_no,),
+            prepare=True,
         ).fetchone()
         if attendance_student:
             attendance_records = db.execute(
@@ -2062,26 +4308,364 @@ def teacher_notifications():
             s.roll_no,
             s.department,
             s.semester,
-            SUM(CASE WHEN ar.status = 1 THEN 1 ELSE 0 END) AS attended_classes,
-            COUNT(ar.id) AS total_classes,
-            ROUND(
-                (100.0 * SUM(CASE WHEN ar.status = 1 THEN 1 ELSE 0 END)) / COUNT(ar.id),
-                2
-            ) AS attendance_percentage
-        FROM students s
-        LEFT JOIN attendance_records ar ON ar.student_id = s.id
-        GROUP BY s.id, s.name, s.roll_no, s.department, s.semester
-        HAVING COUNT(ar.id) > 0
-           AND ((100.0 * SUM(CASE WHEN ar.status = 1 THEN 1 ELSE 0 END)) / COUNT(ar.id)) < ?
-        ORDER BY attendance_percentage ASC, s.roll_no ASC
-        """,
-        (MIN_PERCENTAGE,),
+            r.attended_classes,
+            r.total_classes,
+            r.attendance_percentage
+        FROM low_attendance_roster r
+        JOIN students s ON s.id = r.student_id
+        ORDER BY r.attendance_percentage ASC, s.roll_no ASC
+        """
+    ).fetchall()
+    threshold_events = db.execute(
+        """
+        SELECT e.event, e.attendance_percentage, e.created_at, s.name, s.roll_no
+        FROM attendance_threshold_events e
+        JOIN students s ON s.id = e.student_id
+        ORDER BY e.created_at DESC, e.id DESC
+        LIMIT 20
+        """
     ).fetchall()
 
     return render_template(
         "teacher_notifications.html",
         low_attendance_students=low_attendance_students,
+        threshold_events=threshold_events,
+    )
+
+
+def _apply_sync_batch(students_payload, attendance_payload, student_lines=None, attendance_lines=None):
+    passwords = sync_default_passwords(get_db(), students_payload)
+
+    def apply_sync(db):
+        return (
+            _upsert_students_from_sync(db, students_payload, lines=student_lines, passwords=passwords),
+            _insert_attendance_from_sync(db, attendance_payload, lines=attendance_lines),
+        )
+
+    return run_write_transaction(apply_sync)
+
+
+def _iter_ndjson_records(stream, max_bytes: Optional[int] = None):
+    # No read goes past SYNC_STREAM_MAX_LINE_BYTES or max_bytes, so neither one huge line
+    # nor a gzip bomb can fill memory.
+    consumed = 0
+    line_no = 0
+    while True:
+        limit = SYNC_STREAM_MAX_LINE_BYTES
+        if max_bytes is not None:
+            limit = min(limit, max_bytes - consumed)
+        raw_line = stream.readline(limit + 1)
+        if max_bytes is not None:
+            consumed += len(raw_line)
+            if consumed > max_bytes:
+                raise ValueError("Decompressed request body is too large")
+        if not raw_line:
+            return
+        line_no += 1
+        if len(raw_line) > SYNC_STREAM_MAX_LINE_BYTES and not raw_line.endswith(b"\n"):
+            raise ValueError(f"line {line_no} is longer than {SYNC_STREAM_MAX_LINE_BYTES} bytes")
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, None
+            continue
+        yield line_no, record
+
+
+def _empty_sync_result():
+    return {"inserted": 0, "updated": 0, "skipped": 0, "errors": []}
+
+
+def _merge_sync_result(total, result):
+    for field in ("inserted", "updated", "skipped"):
+        total[field] += result[field]
+    total["errors"].extend(result["errors"])
+
+
+def _sync_result_messages(result):
+    # Sync functions report (position, message) pairs; responses carry the messages.
+    return {**result, "errors": [message for _, message in result["errors"]]}
+
+
+def _sync_job_response(job):
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "progress": {"processed": job["processed_items"], "total": job["total_items"]},
+        "result": json.loads(job["result"]) if job["result"] else None,
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+
+
+def _sync_job_result(result):
+    return {key: _sync_result_messages(value) for key, value in result.items()}
+
+
+def _get_sync_job(db, job_id: str):
+    return db.execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def _sync_job_is_stale(job, now: Optional[int] = None) -> bool:
+    # A queued job nobody picked up, or a running job whose worker stopped heartbeating.
+    cutoff = (now or int(time.time())) - SYNC_JOB_LEASE_SECONDS
+    if job["status"] == "queued":
+        return job["created_at"] < cutoff
+    if job["status"] == "running":
+        return (job["heartbeat_at"] or job["started_at"] or 0) < cutoff
+    return False
+
+
+def _claimable_sync_job_ids(db, stale_only: bool = False, limit: int = 100) -> List[str]:
+    cutoff = int(time.time()) - SYNC_JOB_LEASE_SECONDS
+    queued = "(status = 'queued' AND created_at < ?)" if stale_only else "status = 'queued'"
+    params = (cutoff, cutoff, limit) if stale_only else (cutoff, limit)
+    rows = db.execute(
+        f"""
+        SELECT id FROM sync_jobs
+        WHERE {queued}
+           OR (status = 'running' AND COALESCE(heartbeat_at, started_at, 0) < ?)
+        ORDER BY created_at, id
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
+def create_sync_job(students_payload, attendance_payload, idempotency_key: str = ""):
+    db = get_db()
+    idempotency_key = idempotency_key or None
+    if idempotency_key:
+        existing = db.execute(
+            "SELECT * FROM sync_jobs WHERE idempotency_key = ?",
+            (idempotency_key,),
+        ).fetchone()
+        if existing and existing["status"] != "failed":
+            return existing, False
+
+    job_id = uuid.uuid4().hex
+    payload_text = json.dumps({"students": students_payload, "attendance": attendance_payload})
+    total_items = _sync_length(students_payload) + _sync_length(attendance_payload)
+
+    def insert_job(db):
+        if idempotency_key:
+            # A failed job is queued again under the same key instead of being duplicated.
+            db.execute(
+                "DELETE FROM sync_jobs WHERE idempotency_key = ? AND status = 'failed'",
+                (idempotency_key,),
+            )
+        db.execute(
+            """
+            INSERT INTO sync_jobs(id, idempotency_key, status, payload, total_items, created_at)
+            VALUES (?, ?, 'queued', ?, ?, ?)
+            """,
+            (job_id, idempotency_key, payload_text, total_items, int(time.time())),
+        )
+
+    try:
+        run_write_transaction(insert_job)
+    except Exception as exc:
+        if not is_integrity_error(exc) or not idempotency_key:
+            raise
+        # Another request with the same key won the race.
+        existing = db.execute(
+            "SELECT * FROM sync_jobs WHERE idempotency_key = ?",
+            (idempotency_key,),
+        ).fetchone()
+        return existing, False
+    return _get_sync_job(db, job_id), True
+
+
+def run_sync_job(job_id: str) -> bool:
+    db = get_db()
+
+    def claim(db):
+        # Running jobs past their lease are taken over and applied again from the start;
+        # the sync upserts make re-applying committed chunks harmless.
+        now = int(time.time())
+        return db.execute(
+            """
+            UPDATE sync_jobs
+            SET status = 'running', started_at = ?, heartbeat_at = ?, processed_items = 0
+            WHERE id = ?
+              AND (status = 'queued'
+                   OR (status = 'running' AND COALESCE(heartbeat_at, started_at, 0) < ?))
+            """,
+            (now, now, job_id, now - SYNC_JOB_LEASE_SECONDS),
+        ).rowcount
+
+    if not run_write_transaction(claim):
+        return False
+
+    job = _get_sync_job(db, job_id)
+    payload = json.loads(job["payload"] or "{}")
+    result = {"students": _empty_sync_result(), "attendance": _empty_sync_result()}
+    processed = 0
+
+    def apply_chunk(sync_fn, key, chunk, start):
+        options = {"passwords": sync_default_passwords(db, chunk)} if key == "students" else {}
+
+        def apply(db):
+            chunk_result = sync_fn(db, chunk, start, **options)
+            db.execute(
+                "UPDATE sync_jobs SET processed_items = ?, heartbeat_at = ? WHERE id = ?",
+                (processed + _sync_length(chunk), int(time.time()), job_id),
+            )
+            return chunk_result
+
+        _merge_sync_result(result[key], run_write_transaction(apply))
+
+    try:
+        for key, sync_fn in (
+            ("students", _upsert_students_from_sync),
+            ("attendance", _insert_attendance_from_sync),
+        ):
+            items = payload.get(key) or []
+            chunk_size = max(1, SYNC_CHUNK_SIZE)
+            for offset in range(0, _sync_length(items), chunk_size):
+                chunk = _sync_slice(items, offset, offset + chunk_size)
+                apply_chunk(sync_fn, key, chunk, offset + 1)
+                processed += _sync_length(chunk)
+    except Exception as exc:
+        app.logger.exception("Sync job %s failed", job_id)
+        db.rollback()
+        error_text = str(exc)
+        run_write_transaction(
+            lambda db: db.execute(
+                """
+                UPDATE sync_jobs
+                SET status = 'failed', result = ?, error = ?, finished_at = ?
+                WHERE id = ?
+                """,
+                (json.dumps(_sync_job_result(result)), error_text, int(time.time()), job_id),
+            )
+        )
+        return True
+
+    run_write_transaction(
+        lambda db: db.execute(
+            """
+            UPDATE sync_jobs
+            SET status = 'succeeded', payload = NULL, result = ?, finished_at = ?
+            WHERE id = ?
+            """,
+            (json.dumps(_sync_job_result(result)), int(time.time()), job_id),
+        )
     )
+    return True
+
+
+def _run_sync_job_in_background(job_id: str):
+    with app.app_context():
+        run_sync_job(job_id)
+
+
+def _submit_sync_job(job_id: str):
+    global _SYNC_JOB_EXECUTOR, _SYNC_JOB_EXECUTOR_PID
+    if SYNC_JOB_EXECUTOR not in {"thread", "process"}:
+        return
+    with _SYNC_JOB_EXECUTOR_LOCK:
+        if _SYNC_JOB_EXECUTOR is None or _SYNC_JOB_EXECUTOR_PID != os.getpid():
+            if SYNC_JOB_EXECUTOR == "process":
+                _SYNC_JOB_EXECUTOR = ProcessPoolExecutor(
+                    max_workers=max(1, SYNC_JOB_WORKERS),
+                    mp_context=_process_context(),
+                )
+            else:
+                _SYNC_JOB_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, SYNC_JOB_WORKERS),
+                    thread_name_prefix="sync-job",
+                )
+            _SYNC_JOB_EXECUTOR_PID = os.getpid()
+        _SYNC_JOB_EXECUTOR.submit(_run_sync_job_in_background, job_id)
+
+
+@atexit.register
+def _shutdown_sync_job_executor():
+    # Jobs still waiting stay queued in sync_jobs and are picked up again once stale.
+    executor = _SYNC_JOB_EXECUTOR
+    if executor is not None and _SYNC_JOB_EXECUTOR_PID == os.getpid():
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def recover_sync_jobs() -> int:
+    if SYNC_JOB_EXECUTOR not in {"thread", "process"}:
+        return 0
+    job_ids = _claimable_sync_job_ids(get_db(), stale_only=True)
+    for job_id in job_ids:
+        _submit_sync_job(job_id)
+    return len(job_ids)
+
+
+def _wants_async_sync() -> bool:
+    if request.args.get("async", "").strip().lower() in {"1", "true", "yes"}:
+        return True
+    return "respond-async" in (request.headers.get("Prefer", "") or "").lower()
+
+
+def _decode_columnar_payload(columns, label: str):
+    # {"roll_no": [...], "subject": {"values": [...], "indexes": [...]}, ...} -> {"roll_no": [...], "subject": [...]}
+    # The sync validators read these columns directly, so no per-record dict is built.
+    decoded = {}
+    for field, column in columns.items():
+        if isinstance(column, dict):
+            values = column.get("values")
+            indexes = column.get("indexes")
+            if not isinstance(values, list) or not isinstance(indexes, list):
+                raise ValueError(f"'{label}.{field}' must have 'values' and 'indexes' arrays")
+            if any(
+                index is not None
+                and (isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < len(values))
+                for index in indexes
+            ):
+                raise ValueError(f"'{label}.{field}' has an index outside 'values'")
+            column = [values[index] if index is not None else None for index in indexes]
+        elif not isinstance(column, list):
+            raise ValueError(f"'{label}.{field}' must be an array or a dictionary-encoded object")
+        decoded[str(field)] = column
+
+    lengths = {len(column) for column in decoded.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All '{label}' columns must have the same length")
+    return decoded
+
+
+def _read_push_payload():
+    body = request.get_data(cache=False)
+    if (request.headers.get("Content-Encoding", "") or "").strip().lower() == "gzip":
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        try:
+            body = decompressor.decompress(body, SYNC_MAX_BODY_BYTES)
+        except zlib.error as exc:
+            raise ValueError(f"Could not decompress request body: {exc}") from None
+        if decompressor.unconsumed_tail:
+            raise ValueError("Decompressed request body is too large")
+
+    if request.mimetype in MSGPACK_CONTENT_TYPES:
+        if msgpack is None:
+            raise ValueError("msgpack payloads are not supported on this server")
+        try:
+            payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+        except Exception:
+            raise ValueError("Invalid msgpack payload") from None
+    else:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise ValueError("Invalid JSON payload") from None
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid JSON payload")
+
+    for key in ("students", "attendance"):
+        if isinstance(payload.get(key), dict):
+            payload[key] = _decode_columnar_payload(payload[key], key)
+    return payload
 
 
 @app.route("/api/integrations/push", methods=["POST"])
@@ -2089,38 +4673,561 @@ def integrations_push():
     if not _is_external_sync_authorized():
         return jsonify({"ok": False, "error": "Unauthorized"}), 401
 
-    payload = request.get_json(silent=True)
-    if not isinstance(payload, dict):
-        return jsonify({"ok": False, "error": "Invalid JSON payload"}), 400
+    try:
+        payload = _read_push_payload()
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
 
     students_payload = payload.get("students", [])
     attendance_payload = payload.get("attendance", [])
 
-    if not isinstance(students_payload, list) or not isinstance(attendance_payload, list):
+    if not isinstance(students_payload, (list, dict)) or not isinstance(attendance_payload, (list, dict)):
         return jsonify(
             {
                 "ok": False,
-                "error": "Both 'students' and 'attendance' must be arrays when provided",
+                "error": "Both 'students' and 'attendance' must be arrays or columnar objects when provided",
             }
         ), 400
 
-    db = get_db()
-    student_result = _upsert_students_from_sync(db, students_payload)
-    attendance_result = _insert_attendance_from_sync(db, attendance_payload)
-    db.commit()
+    if _wants_async_sync():
+        job, created = create_sync_job(
+            students_payload,
+            attendance_payload,
+            (request.headers.get("Idempotency-Key", "") or "").strip(),
+        )
+        if created or _sync_job_is_stale(job):
+            _submit_sync_job(job["id"])
+        response = jsonify({"ok": True, "job": _sync_job_response(job)})
+        response.headers["Location"] = url_for("integrations_job_status", job_id=job["id"])
+        return response, 202
+
+    student_result, attendance_result = _apply_sync_batch(students_payload, attendance_payload)
 
     return jsonify(
         {
             "ok": True,
-            "students": student_result,
-            "attendance": attendance_result,
+            "students": _sync_result_messages(student_result),
+            "attendance": _sync_result_messages(attendance_result),
+        }
+    )
+
+
+@app.route("/api/integrations/push/stream", methods=["POST"])
+def integrations_push_stream():
+    if not _is_external_sync_authorized():
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    chunk_size = request.args.get("chunk_size", type=int) or SYNC_STREAM_CHUNK_SIZE
+    chunk_size = min(max(1, chunk_size), SYNC_STREAM_MAX_CHUNK_SIZE)
+    stream = request.stream
+    max_bytes = None
+    if (request.headers.get("Content-Encoding", "") or "").strip().lower() == "gzip":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+        max_bytes = SYNC_MAX_BODY_BYTES
+
+    # Only totals and the first SYNC_STREAM_MAX_ERRORS errors are kept, so memory and
+    # the response stay the same size however long the upload is.
+    totals = {
+        "students": {"inserted": 0, "updated": 0, "skipped": 0},
+        "attendance": {"inserted": 0, "updated": 0, "skipped": 0},
+    }
+    summary = {"lines": 0, "chunks": 0, "invalid_lines": 0, "error_count": 0}
+    errors = []
+    buffers = {"student": ([], []), "attendance": ([], [])}
+
+    def record_errors(new_errors):
+        summary["error_count"] += len(new_errors)
+        room = SYNC_STREAM_MAX_ERRORS - len(errors)
+        if room > 0:
+            errors.extend({"line": line, "error": message} for line, message in sorted(new_errors)[:room])
+
+    def flush():
+        (students, student_lines), (attendance, attendance_lines) = buffers["student"], buffers["attendance"]
+        student_result, attendance_result = _apply_sync_batch(students, attendance, student_lines, attendance_lines)
+        for key, result in (("students", student_result), ("attendance", attendance_result)):
+            for field in ("inserted", "updated", "skipped"):
+                totals[key][field] += result[field]
+            record_errors(result["errors"])
+        summary["chunks"] += 1
+        for records, lines in buffers.values():
+            records.clear()
+            lines.clear()
+
+    def response_body():
+        return {
+            "lines": summary["lines"],
+            "chunks": summary["chunks"],
+            "invalid_lines": summary["invalid_lines"],
+            **totals,
+            "errors": sorted(errors, key=lambda error: error["line"]),
+            "errors_truncated": max(0, summary["error_count"] - len(errors)),
         }
+
+    pending = 0
+    ndjson = _iter_ndjson_records(stream, max_bytes)
+    while True:
+        try:
+            item = next(ndjson, None)
+        except (OSError, EOFError, zlib.error, ValueError) as exc:
+            return jsonify({"ok": False, "error": f"Could not read request body: {exc}", **response_body()}), 400
+        if item is None:
+            break
+        line_no, record = item
+        summary["lines"] += 1
+        record_type = record.get("type") if isinstance(record, dict) else None
+        if record_type in buffers:
+            records, lines = buffers[record_type]
+            records.append(record)
+            lines.append(line_no)
+            pending += 1
+        else:
+            summary["invalid_lines"] += 1
+            problem = "is not valid JSON" if record is None else "has no 'type' of student or attendance"
+            record_errors([(line_no, f"line {line_no} {problem}")])
+        if pending >= chunk_size:
+            flush()
+            pending = 0
+
+    if pending:
+        flush()
+
+    return jsonify({"ok": True, **response_body()})
+
+
+@app.route("/api/integrations/jobs/<job_id>", methods=["GET"])
+def integrations_job_status(job_id):
+    if not _is_external_sync_authorized():
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    job = _get_sync_job(get_db(), job_id)
+    if not job:
+        return jsonify({"ok": False, "error": "Job not found"}), 404
+    return jsonify({"ok": True, "job": _sync_job_response(job)})
+
+
+def _parse_change_cursor(value: str) -> Optional[Tuple[int, int]]:
+    value = (value or "").strip()
+    if not value:
+        return 0, 0
+    txid, _, seq = value.partition("-")
+    try:
+        cursor = int(txid), int(seq or 0)
+    except ValueError:
+        return None
+    if min(cursor) < 0:
+        return None
+    return cursor
+
+
+def _fetch_rows_by_id(db, query: str, ids) -> Dict[int, Dict[str, Any]]:
+    rows = {}
+    for chunk in _chunked(sorted(ids), SQL_MAX_PARAMETERS):
+        placeholders = ", ".join("?" for _ in chunk)
+        for row in db.execute(query.format(placeholders=placeholders), chunk).fetchall():
+            rows[row["id"]] = dict(row)
+    return rows
+
+
+def get_changes(db, cursor: Tuple[int, int], limit: int):
+    visible = ""
+    if db.backend == "postgres":
+        visible = "AND txid < txid_snapshot_xmin(txid_current_snapshot())"
+    entries = db.execute(
+        f"""
+        SELECT seq, txid, entity, entity_id, operation, changed_at
+        FROM change_log
+        WHERE (txid, seq) > (?, ?) {visible}
+        ORDER BY txid, seq
+        LIMIT ?
+        """,
+        (cursor[0], cursor[1], limit + 1),
+    ).fetchall()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Only the newest entry per row is reported, with the row as it is now.
+    latest = {}
+    for entry in entries:
+        latest.pop((entry["entity"], entry["entity_id"]), None)
+        latest[(entry["entity"], entry["entity_id"])] = entry
+
+    student_ids = {entity_id for entity, entity_id in latest if entity == "student"}
+    attendance_ids = {entity_id for entity, entity_id in latest if entity == "attendance"}
+    rows = {
+        "student": _fetch_rows_by_id(
+            db,
+            f"SELECT id, {', '.join(CHANGE_FEED_STUDENT_COLUMNS)} FROM students WHERE id IN ({{placeholders}})",
+            student_ids,
+        ),
+        "attendance": _fetch_rows_by_id(
+            db,
+            """
+            SELECT a.id, a.student_id, s.roll_no, a.attendance_date, a.subject, a.status
+            FROM attendance_records a
+            JOIN students s ON s.id = a.student_id
+            WHERE a.id IN ({placeholders})
+            """,
+            attendance_ids,
+        ),
+    }
+
+    changes = []
+    for (entity, entity_id), entry in latest.items():
+        data = rows[entity].get(entity_id)
+        changes.append(
+            {
+                "cursor": f"{entry['txid']}-{entry['seq']}",
+                "entity": entity,
+                "id": entity_id,
+                "operation": "upsert" if data else "delete",
+                "changed_at": entry["changed_at"],
+                "data": data,
+            }
+        )
+
+    next_cursor = cursor
+    if entries:
+        next_cursor = (entries[-1]["txid"], entries[-1]["seq"])
+    return changes, f"{next_cursor[0]}-{next_cursor[1]}", has_more
+
+
+def prune_change_log(db, older_than_days: int) -> Tuple[int, int]:
+    # Superseded entries can go at any time: get_changes only reports the newest entry per row.
+    compacted = db.execute(
+        """
+        DELETE FROM change_log
+        WHERE EXISTS (
+            SELECT 1 FROM change_log newer
+            WHERE newer.entity = change_log.entity
+              AND newer.entity_id = change_log.entity_id
+              AND (newer.txid, newer.seq) > (change_log.txid, change_log.seq)
+        )
+        """
+    ).rowcount
+    # Only tombstones expire: an upsert may be the sole entry a new consumer reading from an
+    # empty cursor has for a live row, and compaction already bounds those to one per row.
+    expired = 0
+    if older_than_days > 0:
+        expired = db.execute(
+            "DELETE FROM change_log WHERE operation = 'delete' AND changed_at < ?",
+            (int(time.time()) - older_than_days * 86400,),
+        ).rowcount
+    return compacted, expired
+
+
+@app.route("/api/integrations/changes", methods=["GET"])
+def integrations_changes():
+    if not _is_external_sync_authorized():
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    cursor = _parse_change_cursor(request.args.get("since", ""))
+    if cursor is None:
+        return jsonify({"ok": False, "error": "Invalid cursor"}), 400
+    try:
+        limit = int(request.args.get("limit", CHANGE_FEED_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit must be an integer"}), 400
+    limit = min(max(1, limit), CHANGE_FEED_MAX_PAGE_SIZE)
+
+    changes, next_cursor, has_more = get_changes(get_db(), cursor, limit)
+    return jsonify({"ok": True, "changes": changes, "next_cursor": next_cursor, "has_more": has_more})
+
+
+@app.route("/api/integrations/db-stats", methods=["GET"])
+def integrations_db_stats():
+    if not _is_external_sync_authorized():
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    return jsonify({"ok": True, "stats": get_db_pool_stats()})
+
+
+attendance_cli = AppGroup("attendance", help="Attendance data maintenance commands.")
+app.cli.add_command(attendance_cli)
+
+
+@attendance_cli.command("dedupe")
+@click.option(
+    "--enforce",
+    is_flag=True,
+    help="Also create the unique index on (student_id, attendance_date, subject).",
+)
+def attendance_dedupe_command(enforce):
+    """Remove duplicate attendance rows for the same student, date and subject."""
+    db = get_db()
+    deleted = dedupe_attendance_records(db)
+    if enforce:
+        create_attendance_unique_index(db)
+    db.commit()
+    click.echo(f"Removed {deleted} duplicate attendance rows.")
+    if enforce:
+        click.echo(f"Unique index {ATTENDANCE_UNIQUE_INDEX_NAME} is in place.")
+
+
+@attendance_cli.command("backfill-defaults")
+def attendance_backfill_defaults_command():
+    """Fill in missing student passwords and student or teacher emails."""
+    db = get_db()
+    _backfill_account_defaults(db)
+    db.commit()
+    click.echo("Filled in missing student passwords and account emails.")
+
+
+@attendance_cli.command("prune-changes")
+@click.option(
+    "--older-than-days",
+    default=CHANGE_FEED_RETENTION_DAYS,
+    show_default=True,
+    help="Also drop delete entries older than this many days (0 keeps them).",
+)
+def attendance_prune_changes_command(older_than_days):
+    """Compact change_log to the newest entry per row and drop expired deletions."""
+    db = get_db()
+    compacted, expired = prune_change_log(db, older_than_days)
+    db.commit()
+    click.echo(f"Removed {compacted} superseded and {expired} expired delete change_log entries.")
+
+
+@attendance_cli.command("sync-worker")
+@click.option("--once", is_flag=True, help="Exit when no queued jobs are left.")
+@click.option("--poll-interval", default=5.0, show_default=True, help="Seconds between polls.")
+def attendance_sync_worker_command(once, poll_interval):
+    """Process queued /api/integrations/push jobs."""
+    while True:
+        job_ids = _claimable_sync_job_ids(get_db(), limit=1)
+        if job_ids:
+            if run_sync_job(job_ids[0]):
+                click.echo(f"Processed sync job {job_ids[0]}.")
+            continue
+        if once:
+            break
+        get_db().rollback()
+        time.sleep(poll_interval)
+
+
+@attendance_cli.command("hash-passwords")
+@click.option("--batch-size", default=500, show_default=True, help="Students hashed per batch.")
+@click.option("--watch", is_flag=True, help="Keep polling for new pending passwords.")
+@click.option("--poll-interval", default=30.0, show_default=True, help="Seconds between polls with --watch.")
+def attendance_hash_passwords_command(batch_size, watch, poll_interval):
+    """Replace pending default passwords with real hashes."""
+    total = 0
+    while True:
+        hashed = hash_pending_passwords(get_db(), max(1, batch_size))
+        total += hashed
+        if hashed:
+            click.echo(f"Hashed {total} pending default passwords.")
+            continue
+        if not watch:
+            break
+        time.sleep(poll_interval)
+    if not total:
+        click.echo("No pending default passwords.")
+
+
+def _progress_reporter(label: str, started: float):
+    def report(done, total, rows):
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        of_total = f"/{total}" if total is not None else ""
+        click.echo(f"{label}: {done}{of_total} students, {rows} rows written, {rows / elapsed:.0f} rows/s")
+
+    return report
+
+
+@attendance_cli.command("import-students")
+@click.option("--force", is_flag=True, help="Re-import every row even if the workbook is unchanged.")
+@click.option("--sheet", "sheets", multiple=True, help="Worksheet to read (repeatable); defaults to STUDENT_DATA_SHEETS.")
+@click.option("--chunk-size", type=int, default=None, help="Students per commit [default: STUDENT_IMPORT_CHUNK_SIZE].")
+def attendance_import_students_command(force, sheets, chunk_size):
+    """Import student master data from STUDENT_DATA_XLSX."""
+    if not _student_data_path():
+        click.echo("No student workbook found.")
+        return
+    started = time.perf_counter()
+    report = _progress_reporter("Students", started)
+    import_students_data(force, list(sheets) or None, chunk_size, report)
+    click.echo(f"Student import finished in {time.perf_counter() - started:.2f}s.")
+
+
+@attendance_cli.command("import-docx")
+@click.option("--force", is_flag=True, help="Re-import every file even if it is unchanged.")
+@click.option("--chunk-size", type=int, default=None, help="Students per commit [default: MAINTENANCE_CHUNK_SIZE].")
+def attendance_import_docx_command(force, chunk_size):
+    """Import class attendance from the CLASS_ATTENDANCE_DOCX files."""
+    if Document is None:
+        raise click.ClickException("python-docx is not installed.")
+    started = time.perf_counter()
+    report = _progress_reporter("Class attendance", started)
+    files = import_class_docx_attendance(force, chunk_size, report)
+    for entry in files:
+        state = "unchanged" if entry["skipped"] else f"{entry['applied']} changed"
+        click.echo(f"{entry['path']}: {entry['rows']} rows, {state}")
+    click.echo(f"Imported {len(files)} class files in {time.perf_counter() - started:.2f}s.")
+
+
+@attendance_cli.command("seed-civil")
+@click.option("--chunk-size", type=int, default=None, help="Students per commit [default: MAINTENANCE_CHUNK_SIZE].")
+@click.option("--force", is_flag=True, help="Rewrite every student, including those already seeded.")
+def attendance_seed_civil_command(chunk_size, force):
+    """Load the built-in CIVIL attendance data."""
+    started = time.perf_counter()
+    report = _progress_reporter("CIVIL attendance", started)
+    seeded = seed_civil_attendance_data(chunk_size, report, force)
+    click.echo(f"CIVIL attendance seeded for {seeded} students in {time.perf_counter() - started:.2f}s.")
+
+
+@attendance_cli.command("normalize")
+@click.option("--chunk-size", type=int, default=None, help="Students per commit [default: MAINTENANCE_CHUNK_SIZE].")
+def attendance_normalize_command(chunk_size):
+    """Rewrite attendance that falls outside the snapshot window."""
+    started = time.perf_counter()
+    report = _progress_reporter("Normalised", started)
+    fixed = normalize_attendance_window_if_needed(chunk_size, report)
+    click.echo(f"Normalised {fixed} students in {time.perf_counter() - started:.2f}s.")
+
+
+def _attendance_row_counts(db, student_ids) -> Dict[int, int]:
+    counts = {}
+    for chunk in _chunked(sorted(student_ids), SQL_MAX_PARAMETERS):
+        rows = db.execute(
+            f"""
+            SELECT student_id, COUNT(*) AS total
+            FROM attendance_records
+            WHERE student_id IN ({', '.join('?' for _ in chunk)})
+            GROUP BY student_id
+            """,
+            chunk,
+        ).fetchall()
+        counts.update((row["student_id"], int(row["total"])) for row in rows)
+    return counts
+
+
+def plan_maintenance(db, force: bool = False) -> dict:
+    # Each section is planned against the current database, not against the result of the others.
+    students = plan_students_import(db, force)
+
+    class_docx = {"files": [], "create": 0, "update": 0, "rows_to_delete": 0, "rows_to_insert": 0, "departments": {}}
+    if Document is not None:
+        docx_plan = plan_class_docx_import(db, force)
+        started = time.perf_counter()
+        updated_ids = [
+            docx_plan["existing"][roll_no] for change in docx_plan["changes"] for roll_no in change["updates"]
+        ]
+        current_rows = _attendance_row_counts(db, updated_ids)
+        class_docx["rows_to_delete"] = sum(current_rows.values())
+        for change in docx_plan["changes"]:
+            counts = class_docx["departments"].setdefault(
+                change["class_label"] or "N/A", {"create": 0, "update": 0, "rows_to_insert": 0}
+            )
+            for action in ("create", "update"):
+                rows = change[f"{action}s"]
+                class_docx[action] += len(rows)
+                counts[action] += len(rows)
+                inserted = sum(max(0, row["total"]) for row in rows.values())
+                class_docx["rows_to_insert"] += inserted
+                counts["rows_to_insert"] += inserted
+        class_docx["files"] = docx_plan["files"]
+        class_docx["timings"] = {**docx_plan["timings"], "count": time.perf_counter() - started}
+
+    started = time.perf_counter()
+    normalization = plan_attendance_normalization(db)
+    normalize = {
+        "students": len(normalization),
+        "rows_to_delete": 0,
+        "rows_to_insert": 0,
+        "departments": {},
+        "timings": {"query_and_diff": time.perf_counter() - started},
+    }
+    for entry in normalization.values():
+        counts = normalize["departments"].setdefault(
+            entry["department"], {"students": 0, "rows_to_delete": 0, "rows_to_insert": 0}
+        )
+        counts["students"] += 1
+        for key, value in (("rows_to_delete", entry["current_total"]), ("rows_to_insert", entry["target_total"])):
+            normalize[key] += value
+            counts[key] += value
+
+    db.rollback()
+    return {"students_xlsx": students, "class_docx": class_docx, "normalize": normalize}
+
+
+def _echo_plan_section(title: str, totals: dict, departments: dict, timings: dict):
+    click.echo(title)
+    click.echo("  " + ", ".join(f"{key.replace('_', ' ')}: {value}" for key, value in totals.items()))
+    for department, counts in sorted(departments.items()):
+        click.echo(f"    {department}: " + ", ".join(f"{key.replace('_', ' ')} {value}" for key, value in counts.items()))
+    if timings:
+        click.echo("  timings: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in timings.items()))
+
+
+@attendance_cli.command("plan")
+@click.option("--force", is_flag=True, help="Plan as if every import file had changed.")
+@click.option("--json", "as_json", is_flag=True, help="Print the plan as JSON.")
+def attendance_plan_command(force, as_json):
+    """Show what the imports and normalisation would change, without writing."""
+    plan = plan_maintenance(get_db(), force)
+    if as_json:
+        click.echo(json.dumps(plan, indent=2, sort_keys=True))
+        return
+
+    students = plan["students_xlsx"]
+    if not students["path"]:
+        click.echo("Student data: no workbook found")
+    elif students["skipped"]:
+        click.echo(f"Student data: {students['path']} unchanged since the last import")
+    else:
+        _echo_plan_section(
+            f"Student data: {students['path']}",
+            {key: students[key] for key in ("rows", "create", "update", "stale_manifest_rows")},
+            students["departments"],
+            students["timings"],
+        )
+
+    class_docx = plan["class_docx"]
+    for entry in class_docx["files"]:
+        state = "unchanged" if entry["skipped"] else f"{entry['applied']} changed, parsed in {entry['parse_seconds']:.2f}s"
+        click.echo(f"Class file {entry['path']}: {entry['rows']} rows, {state}")
+    _echo_plan_section(
+        "Class attendance documents:",
+        {key: class_docx[key] for key in ("create", "update", "rows_to_delete", "rows_to_insert")},
+        class_docx["departments"],
+        class_docx.get("timings", {}),
+    )
+
+    normalize = plan["normalize"]
+    _echo_plan_section(
+        "Attendance window normalisation:",
+        {key: normalize[key] for key in ("students", "rows_to_delete", "rows_to_insert")},
+        normalize["departments"],
+        normalize["timings"],
     )
 
 
-with app.app_context():
-    init_db()
-    run_startup_maintenance()
+@attendance_cli.command("summary")
+@click.option("--rebuild", is_flag=True, help="Recompute every student's summary row.")
+def attendance_summary_command(rebuild):
+    """Verify (or rebuild) student_attendance_summary against attendance_records."""
+    db = get_db()
+    if rebuild:
+        rebuild_attendance_summary(db)
+        rebuild_low_attendance_roster(db)
+        db.commit()
+    drifted = verify_attendance_summary(db)
+    for row in drifted[:20]:
+        click.echo(
+            f"{row['roll_no']}: summary {row['summary_attended']}/{row['summary_total']}, "
+            f"actual {row['actual_attended']}/{row['actual_total']}"
+        )
+    if drifted:
+        click.echo(f"{len(drifted)} students out of sync. Run with --rebuild to fix.")
+    else:
+        click.echo("Attendance summary is in sync.")
+
+
+# Process-pool children import this module only to run a job; the parent has already set up the database.
+if multiprocessing.parent_process() is None:
+    with app.app_context():
+        init_db()
+        run_startup_maintenance()
 
 
 if __name__ == "__main__":
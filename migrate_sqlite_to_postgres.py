@@ -47,6 +47,8 @@ def create_postgres_tables(pg_conn):
             CREATE INDEX IF NOT EXISTS idx_students_email ON students(email);
             CREATE UNIQUE INDEX IF NOT EXISTS idx_teachers_username ON teachers(username);
             CREATE INDEX IF NOT EXISTS idx_teachers_email ON teachers(email);
+            CREATE INDEX IF NOT EXISTS idx_attendance_student_lookup
+                ON attendance_records(student_id, attendance_date, subject, status);
             """
         )
     pg_conn.commit()
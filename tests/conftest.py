@@ -0,0 +1,117 @@
+import os
+import sys
+import tempfile
+
+# app.py initialises its database at import time, so the environment is set first.
+os.environ["ATTENDANCE_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="attendance-tests-"), "session.db")
+os.environ["DATABASE_URL"] = ""
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["DEFAULT_PASSWORD_PENDING"] = "1"
+os.environ["DOCX_PARSE_WORKERS"] = "1"
+os.environ["EXTERNAL_SYNC_TOKEN"] = "test-token"
+os.environ["SQLITE_WRITE_QUEUE"] = "0"
+os.environ["SYNC_JOB_EXECUTOR"] = "external"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+import app as attendance_app  # noqa: E402
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(attendance_app, "DB_PATH", str(tmp_path / "attendance.db"))
+    monkeypatch.setattr(attendance_app, "_SQLITE_READ_POOL", [])
+    monkeypatch.setattr(attendance_app, "_SQLITE_READ_POOL_PID", None)
+    monkeypatch.setattr(attendance_app, "_SQLITE_WAL_READY_PID", None)
+    monkeypatch.setattr(attendance_app, "_ATTENDANCE_UNIQUE_INDEX_PRESENT", {})
+    monkeypatch.setattr(attendance_app, "_ATTENDANCE_SNAPSHOT_CACHE", None)
+    monkeypatch.setattr(attendance_app, "CLASS_DOCX_PATHS", [])
+    with attendance_app.app.app_context():
+        attendance_app.init_db()
+    yield tmp_path
+
+
+@pytest.fixture
+def app_module():
+    return attendance_app
+
+
+@pytest.fixture
+def db():
+    with attendance_app.app.app_context():
+        yield attendance_app.get_db()
+
+
+@pytest.fixture
+def client():
+    return attendance_app.app.test_client()
+
+
+@pytest.fixture
+def teacher_client(client, db):
+    teacher = db.execute(
+        "SELECT id FROM teachers WHERE username = ?",
+        (attendance_app.ADMIN_TEACHER_USERNAME,),
+    ).fetchone()
+    db.rollback()
+    with client.session_transaction() as session:
+        session["role"] = "teacher"
+        session["teacher_id"] = teacher["id"]
+    return client
+
+
+@pytest.fixture
+def make_class_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+
+    def make(name, rows, class_label="CSE-A"):
+        document = docx.Document()
+        document.add_paragraph(f"CLASS: II B.Tech - {class_label} Academic Year 2025")
+        document.add_paragraph("SEMESTER B.Tech-II Semester")
+        table = document.add_table(rows=1, cols=4)
+        headers = ["Regd. No.", "Name of the Student", "Classes Attended", "Classes Conducted"]
+        for cell, header in zip(table.rows[0].cells, headers):
+            cell.text = header
+        for roll_no, attended, total in rows:
+            cells = table.add_row().cells
+            cells[0].text = roll_no
+            cells[1].text = f"Student {roll_no}"
+            cells[2].text = str(attended)
+            cells[3].text = str(total)
+        path = str(tmp_path / f"{name}.docx")
+        document.save(path)
+        return path
+
+    return make
+
+
+def summary_for(db, roll_no):
+    row = db.execute(
+        """
+        SELECT sas.total_classes, sas.attended_classes
+        FROM students s
+        JOIN student_attendance_summary sas ON sas.student_id = s.id
+        WHERE s.roll_no = ?
+        """,
+        (roll_no,),
+    ).fetchone()
+    return (row["attended_classes"], row["total_classes"]) if row else None
+
+
+def assert_summary_consistent(db):
+    drifted = attendance_app.verify_attendance_summary(db)
+    assert [dict(row) for row in drifted] == []
+
+    expected = {
+        row["student_id"]
+        for row in db.execute(
+            "SELECT student_id, total_classes, attended_classes FROM student_attendance_summary"
+        ).fetchall()
+        if attendance_app._low_attendance_percentage(row["attended_classes"], row["total_classes"]) is not None
+    }
+    roster = {row["student_id"] for row in db.execute("SELECT student_id FROM low_attendance_roster").fetchall()}
+    assert roster == expected
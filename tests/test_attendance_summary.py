@@ -0,0 +1,116 @@
+from conftest import AUTH, assert_summary_consistent, summary_for
+
+
+def push(client, students=(), attendance=()):
+    response = client.post(
+        "/api/integrations/push",
+        json={"students": list(students), "attendance": list(attendance)},
+        headers=AUTH,
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def mark(roll_no, subject, day, status):
+    return {"roll_no": roll_no, "subject": subject, "attendance_date": f"2026-01-{day:02d}", "status": status}
+
+
+def test_sync_push_keeps_summary_and_roster(client, db):
+    push(client, [{"roll_no": "S1"}, {"roll_no": "S2"}], [mark("S1", "Maths", 20, 1), mark("S2", "Maths", 20, 0)])
+    assert summary_for(db, "S1") == (1, 1)
+    assert summary_for(db, "S2") == (0, 1)
+    assert_summary_consistent(db)
+
+    # Re-sending a mark updates it in place.
+    push(client, attendance=[mark("S2", "Maths", 20, 1)])
+    db.rollback()
+    assert summary_for(db, "S2") == (1, 1)
+    assert_summary_consistent(db)
+
+
+def test_admin_edits_keep_summary_and_roster(teacher_client, client, db):
+    push(client, [{"roll_no": "A1"}])
+    teacher_client.post(
+        "/admin",
+        data={"action": "add_attendance", "roll_no": "A1", "subject": "Physics", "status": "1", "attendance_date": "2026-01-20"},
+    )
+    teacher_client.post(
+        "/admin",
+        data={"action": "add_attendance", "roll_no": "A1", "subject": "Maths", "status": "1", "attendance_date": "2026-01-20"},
+    )
+    assert summary_for(db, "A1") == (2, 2)
+    assert_summary_consistent(db)
+
+    record_ids = [row["id"] for row in db.execute("SELECT id FROM attendance_records ORDER BY id").fetchall()]
+    db.rollback()
+    teacher_client.post(
+        "/admin",
+        data={"action": "update_attendance", "attendance_roll_no": "A1", "record_id": str(record_ids[0]), "status": "0"},
+    )
+    assert summary_for(db, "A1") == (1, 2)
+    assert_summary_consistent(db)
+    db.rollback()
+
+    teacher_client.post(
+        "/admin",
+        data={
+            "action": "update_attendance_bulk",
+            "attendance_roll_no": "A1",
+            "record_ids": [str(record_id) for record_id in record_ids],
+            f"status_{record_ids[0]}": "0",
+            f"status_{record_ids[1]}": "0",
+        },
+    )
+    assert summary_for(db, "A1") == (0, 2)
+    assert_summary_consistent(db)
+    db.rollback()
+
+    teacher_client.post(
+        "/admin",
+        data={"action": "delete_attendance", "attendance_roll_no": "A1", "record_id": str(record_ids[1])},
+    )
+    assert summary_for(db, "A1") == (0, 1)
+    assert_summary_consistent(db)
+
+
+def test_dedupe_refreshes_summary_and_roster(app_module, client, db):
+    push(client, [{"roll_no": "D1"}], [mark("D1", "Maths", 20, 1)])
+    db.execute(f"DROP INDEX IF EXISTS {app_module.ATTENDANCE_UNIQUE_INDEX_NAME}")
+    student_id = db.execute("SELECT id FROM students WHERE roll_no = 'D1'").fetchone()["id"]
+    db.executemany(
+        "INSERT INTO attendance_records(student_id, attendance_date, subject, status) VALUES (?, ?, ?, ?)",
+        [(student_id, "2026-01-20", "Maths", 0), (student_id, "2026-01-20", "Maths", 0)],
+    )
+    app_module.refresh_attendance_summary(db, [student_id])
+    db.commit()
+    assert summary_for(db, "D1") == (1, 3)
+
+    assert app_module.dedupe_attendance_records(db) == 2
+    db.commit()
+    assert summary_for(db, "D1") == (0, 1)
+    assert_summary_consistent(db)
+
+
+def test_student_without_records_is_consistent(client, db):
+    push(client, [{"roll_no": "EMPTY"}])
+    db.execute("DELETE FROM student_attendance_summary")
+    db.commit()
+    assert_summary_consistent(db)
+
+
+def test_class_docx_import_keeps_summary_and_roster(app_module, make_class_docx, monkeypatch, db):
+    path = make_class_docx("cse", [("C1", 30, 40), ("C2", 10, 40)])
+    monkeypatch.setattr(app_module, "CLASS_DOCX_PATHS", [path])
+    app_module.import_class_docx_attendance()
+    assert summary_for(db, "C1") == (30, 40)
+    assert summary_for(db, "C2") == (10, 40)
+    assert_summary_consistent(db)
+
+
+def test_civil_seed_and_normalize_keep_summary_and_roster(app_module, client, db):
+    app_module.seed_civil_attendance_data()
+    assert_summary_consistent(db)
+
+    push(client, [{"roll_no": "N1"}], [mark("N1", "Maths", 2, 1)])
+    app_module.normalize_attendance_window_if_needed()
+    assert_summary_consistent(db)
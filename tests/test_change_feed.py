@@ -0,0 +1,28 @@
+import time
+
+from conftest import AUTH
+
+
+def changes(client, since=""):
+    response = client.get(f"/api/integrations/changes?since={since}", headers=AUTH)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_empty_cursor_still_sees_old_rows_after_prune(app_module, client, db):
+    client.post("/api/integrations/push", json={"students": [{"roll_no": "OLD1"}]}, headers=AUTH)
+    client.post(
+        "/api/integrations/push",
+        json={"students": [{"roll_no": "GONE1"}]},
+        headers=AUTH,
+    )
+    db.execute("DELETE FROM students WHERE roll_no = 'GONE1'")
+    db.execute("UPDATE change_log SET changed_at = ?", (int(time.time()) - 40 * 86400,))
+    db.commit()
+
+    result = app_module.app.test_cli_runner().invoke(args=["attendance", "prune-changes"])
+    assert result.exit_code == 0, result.output
+
+    feed = changes(client)
+    assert [change["operation"] for change in feed["changes"]] == ["upsert"]
+    assert feed["changes"][0]["data"]["roll_no"] == "OLD1"
@@ -0,0 +1,49 @@
+import os
+
+from conftest import assert_summary_consistent, summary_for
+
+
+def report(files):
+    return {os.path.basename(entry["path"]): (entry["applied"], entry["skipped"]) for entry in files}
+
+
+def test_unchanged_files_are_skipped(app_module, make_class_docx, monkeypatch, db):
+    path = make_class_docx("cse", [("C1", 30, 40), ("C2", 20, 40)])
+    monkeypatch.setattr(app_module, "CLASS_DOCX_PATHS", [path])
+
+    assert report(app_module.import_class_docx_attendance()) == {"cse.docx": (2, False)}
+    assert report(app_module.import_class_docx_attendance()) == {"cse.docx": (0, True)}
+
+    # Only the modification time moved: the content hash matches, so nothing is parsed.
+    os.utime(path, (1, 1))
+    assert report(app_module.import_class_docx_attendance()) == {"cse.docx": (0, True)}
+
+
+def test_changed_file_rewrites_only_changed_students(app_module, make_class_docx, monkeypatch, db):
+    path = make_class_docx("cse", [("C1", 30, 40), ("C2", 20, 40)])
+    monkeypatch.setattr(app_module, "CLASS_DOCX_PATHS", [path])
+    app_module.import_class_docx_attendance()
+
+    make_class_docx("cse", [("C1", 30, 40), ("C2", 25, 40)])
+    assert report(app_module.import_class_docx_attendance()) == {"cse.docx": (1, False)}
+    assert summary_for(db, "C1") == (30, 40)
+    assert summary_for(db, "C2") == (25, 40)
+    assert_summary_consistent(db)
+
+    assert report(app_module.import_class_docx_attendance(force=True)) == {"cse.docx": (2, False)}
+
+
+def test_later_file_wins_and_dropped_students_fall_back(app_module, make_class_docx, monkeypatch, db):
+    first = make_class_docx("first", [("DUP", 10, 40)], class_label="CSE-A")
+    second = make_class_docx("second", [("DUP", 30, 40)], class_label="CSE-B")
+    monkeypatch.setattr(app_module, "CLASS_DOCX_PATHS", [first, second])
+    app_module.import_class_docx_attendance()
+    assert summary_for(db, "DUP") == (30, 40)
+
+    make_class_docx("second", [("OTHER", 5, 40)], class_label="CSE-B")
+    app_module.import_class_docx_attendance()
+
+    assert summary_for(db, "DUP") == (10, 40)
+    department = db.execute("SELECT department FROM students WHERE roll_no = 'DUP'").fetchone()["department"]
+    assert department.endswith("CSE-A")
+    assert_summary_consistent(db)
@@ -0,0 +1,37 @@
+import os
+
+from conftest import assert_summary_consistent
+
+
+def report(files):
+    return {os.path.basename(entry["path"]): (entry["applied"], entry["skipped"]) for entry in files}
+
+
+def test_interrupted_import_resumes(app_module, make_class_docx, monkeypatch, db):
+    path = make_class_docx("cse", [(f"R{index}", 20, 40) for index in range(5)])
+    monkeypatch.setattr(app_module, "CLASS_DOCX_PATHS", [path])
+
+    calls = []
+    replace = app_module.replace_synthesized_attendance
+
+    def fail_on_second_chunk(db, targets):
+        calls.append(targets)
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return replace(db, targets)
+
+    monkeypatch.setattr(app_module, "replace_synthesized_attendance", fail_on_second_chunk)
+    try:
+        app_module.import_class_docx_attendance(chunk_size=2)
+    except RuntimeError:
+        db.rollback()
+    monkeypatch.setattr(app_module, "replace_synthesized_attendance", replace)
+
+    assert report(app_module.import_class_docx_attendance(chunk_size=2)) == {"cse.docx": (3, False)}
+    assert_summary_consistent(db)
+
+
+def test_civil_seed_resumes_from_the_manifest(app_module, db):
+    assert app_module.seed_civil_attendance_data() == len({row[0] for row in app_module.CIVIL_ATTENDANCE_DATA})
+    assert app_module.seed_civil_attendance_data() == 0
+    assert app_module.seed_civil_attendance_data(force=True) > 0
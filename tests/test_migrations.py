@@ -0,0 +1,74 @@
+from conftest import AUTH
+
+
+def schema_version(db):
+    return db.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()["version"]
+
+
+def test_init_db_on_existing_database_is_a_no_op(app_module, client, db):
+    client.post(
+        "/api/integrations/push",
+        json={"students": [{"roll_no": "M1"}], "attendance": [{"roll_no": "M1", "subject": "Maths", "status": 1}]},
+        headers=AUTH,
+    )
+    counts = {
+        table: db.execute(f"SELECT COUNT(*) AS n FROM {table}").fetchone()["n"]
+        for table in ("students", "teachers", "attendance_records", "change_log", "schema_version")
+    }
+    db.rollback()
+
+    app_module.init_db()
+    app_module.init_db()
+
+    assert schema_version(db) == app_module.SCHEMA_MIGRATIONS[-1][0]
+    for table, count in counts.items():
+        assert db.execute(f"SELECT COUNT(*) AS n FROM {table}").fetchone()["n"] == count
+
+
+def test_later_migrations_can_run_again(app_module, db):
+    # A database recorded at an older version (for example after a crash between a step
+    # and its schema_version row) re-runs the later steps without failing.
+    db.execute("DELETE FROM schema_version WHERE version > 11")
+    db.commit()
+
+    app_module.init_db()
+
+    assert schema_version(db) == app_module.SCHEMA_MIGRATIONS[-1][0]
+    columns = {row["name"] for row in db.execute("PRAGMA table_info(sync_jobs)").fetchall()}
+    assert "heartbeat_at" in columns
+
+
+def test_boot_checks_restore_the_admin_teacher(app_module, db):
+    db.execute("DELETE FROM teachers")
+    db.commit()
+
+    app_module.init_db()
+
+    teacher = db.execute(
+        "SELECT username, email FROM teachers WHERE username = ?",
+        (app_module.ADMIN_TEACHER_USERNAME,),
+    ).fetchone()
+    assert teacher["email"] == app_module.ADMIN_TEACHER_EMAIL
+
+
+def test_boot_on_migrated_database_skips_account_backfills(app_module, db, monkeypatch):
+    def unexpected(db):
+        raise AssertionError("account backfill ran at boot")
+
+    monkeypatch.setattr(app_module, "_backfill_student_defaults", unexpected)
+    monkeypatch.setattr(app_module, "_backfill_teacher_emails", unexpected)
+
+    app_module.init_db()
+
+
+def test_backfill_defaults_command_fills_missing_emails(app_module, client, db):
+    client.post("/api/integrations/push", json={"students": [{"roll_no": "B1"}]}, headers=AUTH)
+    db.execute("UPDATE students SET email = NULL WHERE roll_no = 'B1'")
+    db.execute("UPDATE teachers SET email = ''")
+    db.commit()
+
+    result = app_module.app.test_cli_runner().invoke(args=["attendance", "backfill-defaults"])
+    assert result.exit_code == 0, result.output
+
+    assert db.execute("SELECT email FROM students WHERE roll_no = 'B1'").fetchone()["email"] == "b1@college.local"
+    assert db.execute("SELECT COUNT(*) AS n FROM teachers WHERE email = ''").fetchone()["n"] == 0
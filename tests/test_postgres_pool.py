@@ -0,0 +1,55 @@
+import socket
+import time
+
+import pytest
+
+from conftest import AUTH
+
+psycopg_pool = pytest.importorskip("psycopg_pool")
+
+
+@pytest.fixture
+def postgres_url(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "DATABASE_FALLBACK_SQLITE", True)
+    monkeypatch.setattr(app_module, "DATABASE_POOL_ENABLED", True)
+    monkeypatch.setattr(app_module, "_PG_POOLS", {})
+    monkeypatch.setattr(app_module, "_PG_POOLS_PID", None)
+    monkeypatch.setattr(app_module, "_PG_UNREACHABLE", set())
+    yield lambda url: monkeypatch.setattr(app_module, "DATABASE_URL", url)
+    for pool in app_module._PG_POOLS.values():
+        pool.close(timeout=1.0)
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_unreachable_postgres_falls_back_to_sqlite(app_module, postgres_url, monkeypatch):
+    monkeypatch.setattr(app_module, "DATABASE_POOL_TIMEOUT", 1.0)
+    postgres_url(f"postgresql://attendance@127.0.0.1:{closed_port()}/attendance")
+
+    with app_module.app.app_context():
+        app_module.init_db()
+        assert app_module.get_db().backend == "sqlite"
+
+    # Once known to be down, the next request does not wait for the pool timeout.
+    started = time.monotonic()
+    with app_module.app.app_context():
+        assert app_module.get_db().backend == "sqlite"
+    assert time.monotonic() - started < 1.0
+
+
+def test_saturated_pool_returns_503(app_module, client, postgres_url, monkeypatch):
+    class SaturatedPool:
+        def getconn(self):
+            raise psycopg_pool.PoolTimeout("couldn't get a connection after 1.00 sec")
+
+    postgres_url("postgresql://attendance@db.invalid/attendance")
+    monkeypatch.setattr(app_module, "_get_pg_pool", lambda *args, **kwargs: SaturatedPool())
+    monkeypatch.setattr(app_module, "_probe_postgres", lambda conninfo, name: None)
+
+    response = client.post("/api/integrations/push", json={}, headers=AUTH)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,65 @@
+import gzip
+import json
+
+import pytest
+
+from conftest import AUTH, assert_summary_consistent, summary_for
+
+
+def test_gzip_batch_push(client, db):
+    payload = {"students": [{"roll_no": "G1"}]}
+    response = client.post(
+        "/api/integrations/push",
+        data=gzip.compress(json.dumps(payload).encode()),
+        headers={**AUTH, "Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert response.get_json()["students"]["inserted"] == 1
+
+
+def test_columnar_push(client, db):
+    response = client.post(
+        "/api/integrations/push",
+        json={
+            "students": {"roll_no": ["K1", "K2"]},
+            "attendance": {
+                "roll_no": ["K1", "K2", "K1"],
+                "subject": {"values": ["Maths", "Physics"], "indexes": [0, 0, 1]},
+                "attendance_date": {"values": ["2026-01-20"], "indexes": [0, 0, 0]},
+                "status": [1, 0, 1],
+            },
+        },
+        headers=AUTH,
+    )
+    body = response.get_json()
+    assert body["students"]["inserted"] == 2
+    assert body["attendance"]["inserted"] == 3
+    assert summary_for(db, "K1") == (2, 2)
+    assert summary_for(db, "K2") == (0, 1)
+    assert_summary_consistent(db)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        {"values": ["Maths"], "indexes": [1]},
+        {"values": ["Maths", "Physics"], "indexes": [True]},
+        {"values": ["Maths"]},
+    ],
+)
+def test_columnar_push_rejects_bad_dictionary_columns(client, column):
+    response = client.post(
+        "/api/integrations/push",
+        json={"attendance": {"roll_no": ["K1"], "subject": column}},
+        headers=AUTH,
+    )
+    assert response.status_code == 400
+
+
+def test_msgpack_push(client, db):
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/api/integrations/push",
+        data=msgpack.packb({"students": {"roll_no": ["P1"]}}),
+        headers={**AUTH, "Content-Type": "application/msgpack"},
+    )
+    assert response.get_json()["students"]["inserted"] == 1
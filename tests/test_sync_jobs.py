@@ -0,0 +1,52 @@
+from conftest import AUTH
+
+
+def create_job(client, key, students):
+    response = client.post(
+        "/api/integrations/push?async=1",
+        json={"students": students},
+        headers={**AUTH, "Idempotency-Key": key},
+    )
+    assert response.status_code == 202
+    return response.get_json()["job"]
+
+
+def test_async_job_runs_and_reports_progress(app_module, client):
+    job = create_job(client, "job-1", [{"roll_no": "J1"}, {"roll_no": "J2"}])
+    assert job["status"] == "queued"
+
+    with app_module.app.app_context():
+        assert app_module.run_sync_job(job["id"])
+
+    status = client.get(f"/api/integrations/jobs/{job['id']}", headers=AUTH).get_json()["job"]
+    assert status["status"] == "succeeded"
+    assert status["progress"] == {"processed": 2, "total": 2}
+    assert status["result"]["students"]["inserted"] == 2
+
+
+def test_idempotency_key_returns_the_same_job(app_module, client, db):
+    first = create_job(client, "same-key", [{"roll_no": "I1"}])
+    second = create_job(client, "same-key", [{"roll_no": "I1"}])
+    assert second["id"] == first["id"]
+
+    with app_module.app.app_context():
+        assert app_module.run_sync_job(first["id"])
+        assert not app_module.run_sync_job(first["id"])
+    assert create_job(client, "same-key", [{"roll_no": "I1"}])["id"] == first["id"]
+    assert db.execute("SELECT COUNT(*) AS n FROM sync_jobs").fetchone()["n"] == 1
+
+
+def test_stale_running_job_is_reclaimed(app_module, client, db):
+    job = create_job(client, "stale", [{"roll_no": "Z1"}])
+    expired = job["created_at"] - app_module.SYNC_JOB_LEASE_SECONDS - 1
+    db.execute(
+        "UPDATE sync_jobs SET status = 'running', started_at = ?, heartbeat_at = ? WHERE id = ?",
+        (expired, expired, job["id"]),
+    )
+    db.commit()
+
+    assert app_module._claimable_sync_job_ids(db) == [job["id"]]
+    with app_module.app.app_context():
+        assert app_module.run_sync_job(job["id"])
+    db.rollback()
+    assert db.execute("SELECT status FROM sync_jobs WHERE id = ?", (job["id"],)).fetchone()["status"] == "succeeded"
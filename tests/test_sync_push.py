@@ -0,0 +1,24 @@
+from conftest import AUTH, summary_for
+
+
+def test_push_requires_the_bearer_token(client):
+    assert client.post("/api/integrations/push", json={}).status_code == 401
+
+
+def test_batch_push_reports_counts_and_errors(client, db):
+    response = client.post(
+        "/api/integrations/push",
+        json={
+            "students": [{"roll_no": "B1", "name": "Bee"}, {"name": "no roll"}],
+            "attendance": [
+                {"roll_no": "B1", "subject": "Maths", "attendance_date": "2026-01-20", "status": 1},
+                {"roll_no": "NOPE", "subject": "Maths"},
+            ],
+        },
+        headers=AUTH,
+    )
+    body = response.get_json()
+    assert body["students"] == {"inserted": 1, "updated": 0, "skipped": 1, "errors": ["students[2] missing roll_no"]}
+    assert body["attendance"]["inserted"] == 1
+    assert body["attendance"]["errors"] == ["attendance[2] roll_no NOPE not found"]
+    assert summary_for(db, "B1") == (1, 1)
@@ -0,0 +1,68 @@
+import gzip
+import json
+import tracemalloc
+
+from conftest import AUTH, assert_summary_consistent, summary_for
+
+
+def test_stream_push_reports_totals_and_line_numbers(client, db):
+    lines = [
+        json.dumps({"type": "student", "roll_no": "T1"}),
+        "not json",
+        json.dumps({"type": "attendance", "roll_no": "T1", "subject": "Maths", "attendance_date": "2026-01-20", "status": 1}),
+        json.dumps({"type": "attendance", "roll_no": "NOPE", "subject": "Maths"}),
+        json.dumps({"roll_no": "T2"}),
+    ]
+    response = client.post("/api/integrations/push/stream?chunk_size=2", data="\n".join(lines), headers=AUTH)
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["lines"] == 5
+    assert body["invalid_lines"] == 2
+    assert body["students"] == {"inserted": 1, "updated": 0, "skipped": 0}
+    assert body["attendance"] == {"inserted": 1, "updated": 0, "skipped": 1}
+    assert [error["line"] for error in body["errors"]] == [2, 4, 5]
+    assert body["errors_truncated"] == 0
+    assert summary_for(db, "T1") == (1, 1)
+    assert_summary_consistent(db)
+
+
+def test_stream_push_bounds_the_error_sample(app_module, client):
+    body = "\n".join(json.dumps({"type": "attendance", "roll_no": "X", "subject": "Maths"}) for _ in range(150))
+    result = client.post("/api/integrations/push/stream", data=body, headers=AUTH).get_json()
+    assert len(result["errors"]) == app_module.SYNC_STREAM_MAX_ERRORS
+    assert result["errors_truncated"] == 150 - app_module.SYNC_STREAM_MAX_ERRORS
+
+
+def test_stream_push_caps_decompressed_size(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, "SYNC_MAX_BODY_BYTES", 1000)
+    response = client.post(
+        "/api/integrations/push/stream",
+        data=gzip.compress(b"\n" * 10000),
+        headers={**AUTH, "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 400
+
+
+def test_stream_push_does_not_hold_errors_for_invalid_lines(app_module, client):
+    body = b"not json\n" * 50000
+    tracemalloc.start()
+    try:
+        response = client.post("/api/integrations/push/stream", data=body, headers=AUTH)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result = response.get_json()
+    assert result["invalid_lines"] == 50000
+    assert len(result["errors"]) == app_module.SYNC_STREAM_MAX_ERRORS
+    # The body itself is ~450 KB; one queued error per line would add several MB.
+    assert peak < 2 * 1024 * 1024
+
+
+def test_stream_push_rejects_overlong_lines(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, "SYNC_STREAM_MAX_LINE_BYTES", 100)
+    lines = [json.dumps({"type": "student", "roll_no": "L1"}), json.dumps({"type": "student", "name": "x" * 200})]
+    response = client.post("/api/integrations/push/stream?chunk_size=1", data="\n".join(lines), headers=AUTH)
+    body = response.get_json()
+    assert response.status_code == 400
+    assert "line 2" in body["error"]
+    assert body["students"]["inserted"] == 1